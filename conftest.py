@@ -7,6 +7,7 @@ from denoising_demo.test.constants import J_MIN, L_SMALL, B
 from denoising_demo.utils.harmonic_methods import compute_random_signal
 from denoising_demo.utils.vars import RANDOM_SEED
 from denoising_demo.utils.wavelet_methods import (
+    AxisymmetricWavelets,
     axisymmetric_wavelet_forward,
     create_axisymmetric_wavelets,
 )
@@ -23,11 +24,11 @@ def earth() -> np.ndarray:
 
 
 @pytest.fixture(scope="session")
-def axisymmetric_wavelets() -> np.ndarray:
+def axisymmetric_wavelets() -> AxisymmetricWavelets:
     """Creates some axisymmetric wavelets
 
     Returns:
-        np.ndarray: the wavelets
+        AxisymmetricWavelets: the wavelets
     """
     return create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
 
@@ -37,7 +38,7 @@ def axisymmetric_wavelet_coefficients_earth(earth, axisymmetric_wavelets) -> np.
     """Computes the axisymmetric wavelet coefficients of Earth
 
     Args:
-        axisymmetric_wavelets ([type]): the wavelets
+        axisymmetric_wavelets (AxisymmetricWavelets): the wavelets
 
     Returns:
         np.ndarray: the wavelet coefficients
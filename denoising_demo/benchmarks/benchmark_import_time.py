@@ -0,0 +1,86 @@
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+
+from denoising_demo.utils.logger import configure_logging, logger
+
+_modules = [
+    "denoising_demo.scripts.denoise_earth",
+    "denoising_demo.scripts.sweep",
+    "denoising_demo.scripts.monte_carlo",
+    "denoising_demo.plotting.create_plot_sphere",
+]
+# the dependencies which should only be imported on the paths using them
+_lazy_dependencies = ["plotly", "scipy.io", "pys2let"]
+
+
+def _read_args() -> Namespace:
+    """Reads the benchmark settings from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Benchmark the import time of the CLI")
+    parser.add_argument("--modules", "-m", type=str, nargs="+", default=_modules)
+    parser.add_argument("--repeats", "-r", type=int, default=5)
+    return parser.parse_args()
+
+
+def import_time(module: str) -> float:
+    """Measures the cumulative import time of a module in a fresh interpreter
+    through python -X importtime
+
+    Args:
+        module (str): the dotted name of the module
+
+    Returns:
+        float: the import time in seconds
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # the module itself is the last line, columns are self | cumulative | name
+    cumulative = process.stderr.strip().splitlines()[-1].split("|")[1]
+    return int(cumulative) / 1e6
+
+
+def imported_dependencies(module: str) -> list[str]:
+    """Finds which of the lazy dependencies importing a module pulls in
+
+    Args:
+        module (str): the dotted name of the module
+
+    Returns:
+        list[str]: the lazy dependencies imported
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {module}; "
+            f"print(*[m for m in {_lazy_dependencies} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return process.stdout.split()
+
+
+def main() -> None:
+    """Reports the import time of each entry point and checks none of the
+    heavy dependencies are imported eagerly
+    """
+    args = _read_args()
+    configure_logging()
+    for module in args.modules:
+        seconds = min(import_time(module) for _ in range(args.repeats))
+        eager = imported_dependencies(module)
+        logger.info("%s: %.3fs, eager dependencies: %s", module, seconds, eager)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import tracemalloc
+from timeit import repeat
+from typing import Callable
+
+import numpy as np
+
+
+def best_time(func: Callable[[], object], repeats: int) -> float:
+    """Times a function call taking the best of the repeats
+
+    Args:
+        func (Callable[[], object]): a callable with no arguments
+        repeats (int): how many times to time the call
+
+    Returns:
+        float: the fastest time in seconds
+    """
+    return min(repeat(func, number=1, repeat=repeats))
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Measures the peak memory allocated during a function call
+
+    Args:
+        func (Callable[[], object]): a callable with no arguments
+
+    Returns:
+        int: the peak traced allocation in bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fit_scaling_exponent(bandlimits: list[int], values: list[float]) -> float:
+    """Fits the exponent a of values ~ L^a through a least squares straight
+    line in log-log space
+
+    Args:
+        bandlimits (list[int]): the bandlimits L
+        values (list[float]): the measurement at each bandlimit
+
+    Returns:
+        float: the scaling exponent, nan with fewer than two bandlimits
+    """
+    if len(bandlimits) < 2:
+        return np.nan
+    slope, _ = np.polyfit(np.log(bandlimits), np.log(values), 1)
+    return float(slope)
@@ -0,0 +1,69 @@
+from argparse import ArgumentParser, Namespace
+
+import numpy as np
+
+from denoising_demo.benchmarks.benchmark_methods import peak_memory
+from denoising_demo.utils.denoising import (
+    perform_denoising,
+    perform_streaming_denoising,
+)
+from denoising_demo.utils.harmonic_methods import compute_random_signal
+from denoising_demo.utils.logger import configure_logging, logger
+from denoising_demo.utils.noise import create_noise
+from denoising_demo.utils.vars import B_DEFAULT, RANDOM_SEED, SNR_IN_DEFAULT
+from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
+
+_bandlimits = [64, 128, 256, 512]
+_j_mins = [0, 2]
+_n_sigma = 3
+
+
+def _read_args() -> Namespace:
+    """Reads the benchmark settings from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Benchmark the peak memory of denoising")
+    parser.add_argument("--bandlimits", "-L", type=int, nargs="+", default=_bandlimits)
+    parser.add_argument("--parameter", "-B", type=int, default=B_DEFAULT)
+    parser.add_argument("--jmins", "-j", type=int, nargs="+", default=_j_mins)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Compares the peak memory of denoising with the full wavelet stack
+    against streaming one wavelet scale at a time across bandlimits and j_min
+    """
+    args = _read_args()
+    configure_logging()
+    rng = np.random.default_rng(RANDOM_SEED)
+    for L in args.bandlimits:
+        flm = compute_random_signal(L, rng, 1)
+        noised = flm + create_noise(L, flm, SNR_IN_DEFAULT, rng=rng)
+        for j_min in args.jmins:
+            wavelets = create_axisymmetric_wavelets(L, args.parameter, j_min)
+            full = peak_memory(
+                lambda: perform_denoising(
+                    L, flm, noised, wavelets, SNR_IN_DEFAULT, _n_sigma
+                )
+            )
+            streaming = peak_memory(
+                lambda: perform_streaming_denoising(
+                    L, flm, noised, wavelets, SNR_IN_DEFAULT, _n_sigma
+                )
+            )
+            logger.info(
+                "L=%d j_min=%d scales=%d peak: full=%.1fMiB streaming=%.1fMiB "
+                "ratio=%.1fx",
+                L,
+                j_min,
+                wavelets.n_scales,
+                full / 2 ** 20,
+                streaming / 2 ** 20,
+                full / streaming,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import json
+import platform
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pyssht as ssht
+
+from denoising_demo.benchmarks.benchmark_methods import (
+    best_time,
+    fit_scaling_exponent,
+    peak_memory,
+)
+from denoising_demo.data.create_earth_flm import create_flm
+from denoising_demo.plotting.create_plot_sphere import Plot
+from denoising_demo.utils.denoising import perform_denoising
+from denoising_demo.utils.logger import configure_logging, logger
+from denoising_demo.utils.noise import (
+    compute_sigma_j,
+    create_noise,
+    harmonic_hard_thresholding,
+)
+from denoising_demo.utils.tiling_cache import tiling_cache
+from denoising_demo.utils.vars import (
+    B_DEFAULT,
+    J_MIN_DEFAULT,
+    N_SIGMA_DEFAULT,
+    SNR_IN_DEFAULT,
+)
+from denoising_demo.utils.wavelet_methods import (
+    axisymmetric_wavelet_forward,
+    axisymmetric_wavelet_inverse,
+    create_axisymmetric_wavelets,
+)
+
+_bandlimits = [32, 64, 128, 256, 512, 1024, 2048]
+
+# below these the measurements are dominated by noise, so are not compared
+_MIN_SECONDS = 0.01
+_MIN_PEAK_BYTES = 2 ** 20
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements of a stage at a bandlimit"""
+
+    stage: str
+    L: int
+    seconds: float
+    peak_bytes: int
+
+
+def _read_args() -> Namespace:
+    """Reads the benchmark settings from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Benchmark every stage of the pipeline")
+    parser.add_argument("--bandlimits", "-L", type=int, nargs="+", default=_bandlimits)
+    parser.add_argument("--parameter", "-B", type=int, default=B_DEFAULT)
+    parser.add_argument("--jmin", "-j", type=int, default=J_MIN_DEFAULT)
+    parser.add_argument("--repeats", "-r", type=int, default=3)
+    parser.add_argument(
+        "--stages",
+        "-s",
+        type=str,
+        nargs="+",
+        default=None,
+        help="only benchmark these stages: defaults to all",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("bench.json"),
+        help="the JSON file to write the results to",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="a previous JSON file to check for regressions against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="the slowdown or memory growth over the baseline to flag",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=_MIN_SECONDS,
+        help="timings below this are too noisy to compare against the baseline",
+    )
+    return parser.parse_args()
+
+
+def _create_stages(L: int, B: int, j_min: int) -> dict[str, Callable[[], object]]:
+    """Sets up the inputs of each stage at a bandlimit so only the stage
+    itself is measured
+
+    Args:
+        L (int): bandlimit of the signal
+        B (int): positive real parameter
+        j_min (int): controls the lowest wavelet scale
+
+    Returns:
+        dict[str, Callable[[], object]]: a callable with no arguments per stage
+    """
+    flm = create_flm(L)
+    noised_flm = flm + create_noise(L, flm, SNR_IN_DEFAULT)
+    wavelets = create_axisymmetric_wavelets(L, B, j_min)
+    w = axisymmetric_wavelet_forward(L, noised_flm, wavelets)
+    sigma_j = compute_sigma_j(flm, wavelets, SNR_IN_DEFAULT)
+    plot = Plot(ssht.inverse(flm, L), L, "bench")
+    f_plot = plot._prepare_field()
+
+    def create_wavelets() -> None:
+        # time the tiling rather than the cache
+        tiling_cache.clear()
+        create_axisymmetric_wavelets(L, B, j_min)
+
+    return dict(
+        create_flm=lambda: create_flm(L),
+        create_noise=lambda: create_noise(L, flm, SNR_IN_DEFAULT),
+        create_axisymmetric_wavelets=create_wavelets,
+        axisymmetric_wavelet_forward=lambda: axisymmetric_wavelet_forward(
+            L, noised_flm, wavelets
+        ),
+        axisymmetric_wavelet_inverse=lambda: axisymmetric_wavelet_inverse(
+            L, w, wavelets
+        ),
+        harmonic_hard_thresholding=lambda: harmonic_hard_thresholding(
+            L, w.copy(), sigma_j, N_SIGMA_DEFAULT
+        ),
+        perform_denoising=lambda: perform_denoising(
+            L, flm, noised_flm, wavelets, SNR_IN_DEFAULT, N_SIGMA_DEFAULT
+        ),
+        prepare_plot=lambda: Plot.from_flm(flm, L, "bench")._prepare_field(),
+        setup_plot=lambda: Plot._setup_plot(f_plot, plot.resolution),
+    )
+
+
+def _package_version() -> str:
+    """The installed version of the package
+
+    Returns:
+        str: the version, or unknown if not installed
+    """
+    try:
+        return version("denoising_demo")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _find_regressions(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    tolerance: float,
+    min_seconds: float = _MIN_SECONDS,
+) -> list[str]:
+    """Compares the results against those of a previous run, measurements
+    are raised to a floor first so sub-millisecond timings and small
+    allocations, which vary from run to run, are not flagged
+
+    Args:
+        results (list[BenchmarkResult]): the measurements of this run
+        baseline (list[BenchmarkResult]): the measurements of the previous run
+        tolerance (float): the ratio over the baseline to flag
+        min_seconds (float, optional): the floor of the timings.
+        Defaults to _MIN_SECONDS.
+
+    Returns:
+        list[str]: a description of each regression
+    """
+    floors = dict(seconds=min_seconds, peak_bytes=_MIN_PEAK_BYTES)
+    previous = {(r.stage, r.L): r for r in baseline}
+    regressions = []
+    for result in results:
+        reference = previous.get((result.stage, result.L))
+        if reference is None:
+            continue
+        for measure, floor in floors.items():
+            ratio = max(getattr(result, measure), floor) / max(
+                getattr(reference, measure), floor
+            )
+            if ratio > tolerance:
+                regressions.append(
+                    f"{result.stage} L={result.L} {measure}: {ratio:.2f}x"
+                )
+    return regressions
+
+
+def run_benchmarks(
+    bandlimits: list[int],
+    B: int,
+    j_min: int,
+    repeats: int,
+    stages: Optional[list[str]] = None,
+) -> dict:
+    """Times and measures the peak memory of each stage across bandlimits
+    and fits how each scales with L
+
+    Args:
+        bandlimits (list[int]): the bandlimits to benchmark
+        B (int): positive real parameter
+        j_min (int): controls the lowest wavelet scale
+        repeats (int): how many times to time each stage
+        stages (Optional[list[str]], optional): the stages to benchmark.
+        Defaults to None, i.e. all.
+
+    Returns:
+        dict: the settings, the measurements and the scaling exponents
+    """
+    results: list[BenchmarkResult] = []
+    for L in bandlimits:
+        for stage, func in _create_stages(L, B, j_min).items():
+            if stages is not None and stage not in stages:
+                continue
+            seconds = best_time(func, repeats)
+            peak_bytes = peak_memory(func)
+            logger.info(
+                "L=%d %s: %.4fs peak=%.1fMiB", L, stage, seconds, peak_bytes / 2 ** 20
+            )
+            results.append(
+                BenchmarkResult(
+                    stage=stage, L=L, seconds=seconds, peak_bytes=peak_bytes
+                )
+            )
+
+    exponents = {}
+    for stage in dict.fromkeys(r.stage for r in results):
+        measured = [r for r in results if r.stage == stage]
+        exponents[stage] = {
+            measure: fit_scaling_exponent(
+                [r.L for r in measured], [getattr(r, measure) for r in measured]
+            )
+            for measure in ["seconds", "peak_bytes"]
+        }
+        logger.info(
+            "%s scales as L^%.2f in time and L^%.2f in memory",
+            stage,
+            exponents[stage]["seconds"],
+            exponents[stage]["peak_bytes"],
+        )
+    return dict(
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+        version=_package_version(),
+        numpy=np.__version__,
+        python=platform.python_version(),
+        parameters=dict(B=B, j_min=j_min, repeats=repeats),
+        results=results,
+        exponents=exponents,
+    )
+
+
+def main() -> None:
+    """Benchmarks the pipeline, writes the results to JSON and flags any
+    regressions against a baseline run
+    """
+    args = _read_args()
+    configure_logging()
+    summary = run_benchmarks(
+        args.bandlimits, args.parameter, args.jmin, args.repeats, args.stages
+    )
+    args.output.write_text(json.dumps(summary, indent=2, default=asdict))
+    logger.info("written benchmarks to %s", args.output)
+    if args.baseline is None:
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = _find_regressions(
+        summary["results"],
+        [BenchmarkResult(**r) for r in baseline["results"]],
+        args.tolerance,
+        args.min_seconds,
+    )
+    for regression in regressions:
+        logger.warning("regression over %s: %s", args.baseline, regression)
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from argparse import ArgumentParser, Namespace
+
+import numpy as np
+
+from denoising_demo.benchmarks.benchmark_methods import best_time
+from denoising_demo.test.reference_transforms import (
+    loop_wavelet_forward,
+    loop_wavelet_inverse,
+)
+from denoising_demo.utils.harmonic_methods import compute_random_signal
+from denoising_demo.utils.logger import configure_logging, logger
+from denoising_demo.utils.vars import B_DEFAULT, J_MIN_DEFAULT, RANDOM_SEED
+from denoising_demo.utils.wavelet_methods import (
+    axisymmetric_wavelet_forward,
+    axisymmetric_wavelet_inverse,
+    create_axisymmetric_wavelets,
+)
+
+_bandlimits = [64, 128, 256, 512, 1024, 2048]
+
+
+def _read_args() -> Namespace:
+    """Reads the benchmark settings from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Benchmark the axisymmetric transforms")
+    parser.add_argument("--bandlimits", "-L", type=int, nargs="+", default=_bandlimits)
+    parser.add_argument("--parameter", "-B", type=int, default=B_DEFAULT)
+    parser.add_argument("--jmin", "-j", type=int, default=J_MIN_DEFAULT)
+    parser.add_argument("--repeats", "-r", type=int, default=3)
+    parser.add_argument(
+        "--skip-loop",
+        action="store_true",
+        help="only time the vectorised transforms, i.e. for large L",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Compares the vectorised axisymmetric wavelet transforms against the
+    reference loop implementations across bandlimits
+    """
+    args = _read_args()
+    configure_logging()
+    rng = np.random.default_rng(RANDOM_SEED)
+    for L in args.bandlimits:
+        flm = compute_random_signal(L, rng, 1)
+        wavelets = create_axisymmetric_wavelets(L, args.parameter, args.jmin)
+        w = axisymmetric_wavelet_forward(L, flm, wavelets)
+
+        forward = best_time(
+            lambda: axisymmetric_wavelet_forward(L, flm, wavelets), args.repeats
+        )
+        inverse = best_time(
+            lambda: axisymmetric_wavelet_inverse(L, w, wavelets), args.repeats
+        )
+        logger.info("L=%d vectorised: forward=%.4fs inverse=%.4fs", L, forward, inverse)
+        if args.skip_loop:
+            continue
+
+        # the dense wavelets are only needed by the loops
+        dense_wavelets = wavelets.to_dense()
+        loop_forward = best_time(
+            lambda: loop_wavelet_forward(L, flm, dense_wavelets), args.repeats
+        )
+        loop_inverse = best_time(
+            lambda: loop_wavelet_inverse(L, w, dense_wavelets), args.repeats
+        )
+        logger.info(
+            "L=%d loop: forward=%.4fs inverse=%.4fs "
+            "speedup: forward=%.1fx inverse=%.1fx",
+            L,
+            loop_forward,
+            loop_inverse,
+            loop_forward / forward,
+            loop_inverse / inverse,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
+import os
 from pathlib import Path
 
 import numpy as np
-import pyssht as ssht
-from scipy import io as sio
+
+from denoising_demo.utils.harmonic_methods import fill_negative_m
+from denoising_demo.utils.instrumentation import instrumentation
 
 _file_location = Path(__file__).resolve()
 _matfile = _file_location.parent / "EGM2008_Topography_flms_L2190.mat"
+_cachefile = _matfile.with_suffix(".npy")
+_keyfile = _matfile.with_suffix(".key")
 
 
+@instrumentation.timed("create_flm")
 def create_flm(L: int) -> np.ndarray:
     """The harmonic coefficients of the topography of the Earth are read in
     and the missing values are filled in
@@ -18,27 +23,72 @@ def create_flm(L: int) -> np.ndarray:
     Returns:
         np.ndarray: the harmonic coefficients of the data
     """
-    # load in data
-    flm = _load_flm()
+    # load in data, only paging in the coefficients below L
+    flm = np.array(_load_flm()[: L ** 2])
 
     # fill in negative m components so as to avoid confusion with zero values
-    for ell in range(1, L):
-        for m in range(1, ell + 1):
-            ind_pm = ssht.elm2ind(ell, m)
-            ind_nm = ssht.elm2ind(ell, -m)
-            flm_pm = flm[ind_pm]
-            flm[ind_nm] = (-1) ** m * flm_pm.conj()
+    fill_negative_m(flm, L)
 
-    # don't take the full L, invert dataset as Earth backwards
-    flm = flm[: L ** 2].conj()
-    return flm
+    # invert dataset as Earth backwards
+    return flm.conj()
 
 
 def _load_flm() -> np.ndarray:
+    """Memory maps the numpy cache of the harmonic coefficients, the cache is
+    (re)built from the MATLAB binary when missing or when the binary changes
+
+    Returns:
+        np.ndarray: the read-only numpy array of harmonic coefficients
+    """
+    key = _source_key()
+    if not _cachefile.exists() or not _keyfile.exists() or _keyfile.read_text() != key:
+        _write_cache(key)
+    return np.load(_cachefile, mmap_mode="r")
+
+
+def _source_key() -> str:
+    """Identifies the version of the MATLAB binary
+
+    Returns:
+        str: the modification time and size of the binary
+    """
+    stat = _matfile.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _write_cache(key: str) -> None:
+    """Converts the MATLAB binary to a numpy cache, the key is written last so
+    an interrupted conversion is redone. Both go via temporary files named
+    after the process, so concurrent cold starts never clash on a temporary
+    file or read a partial cache
+
+    Args:
+        key (str): the version of the MATLAB binary
+    """
+    pid = os.getpid()
+    tmpfile = _cachefile.with_name(f"{_cachefile.stem}.{pid}.tmp.npy")
+    tmpkey = _keyfile.with_name(f"{_keyfile.stem}.{pid}.tmp.key")
+    np.save(tmpfile, _read_matfile())
+    tmpkey.write_text(key)
+    for tmp, path in [(tmpfile, _cachefile), (tmpkey, _keyfile)]:
+        try:
+            tmp.replace(path)
+        except OSError:
+            # another process has the cache open, i.e. on Windows, having
+            # already put the same conversion in place
+            tmp.unlink()
+            if not path.exists():
+                raise
+
+
+def _read_matfile() -> np.ndarray:
     """Reads in the MATLAB binary and converts it to numpy format
 
     Returns:
         np.ndarray: the numpy array of harmonic coefficients
     """
+    # scipy.io is only needed when the numpy cache is cold
+    from scipy import io as sio
+
     mat_contents = sio.loadmat(str(_matfile))
     return np.ascontiguousarray(mat_contents["flm"][:, 0])
@@ -1,17 +1,20 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
-import plotly.offline as py
 import pyssht as ssht
-from plotly.graph_objs import Figure, Surface
-from plotly.graph_objs.surface import Lighting
 
+from denoising_demo.utils.harmonic_methods import invert_flm_boosted
+from denoising_demo.utils.instrumentation import instrumentation
 from denoising_demo.utils.plot_methods import (
     boost_field,
     calc_plot_resolution,
     create_plot_type,
+    sphere_mesh,
 )
 from denoising_demo.utils.plotly_methods import (
     create_camera,
@@ -19,7 +22,9 @@ from denoising_demo.utils.plotly_methods import (
     create_layout,
     create_tick_mark,
 )
-from denoising_demo.utils.vars import UNSEEN
+from denoising_demo.utils.vars import UNSEEN, WORKERS_DEFAULT
+
+logger = logging.getLogger(__name__)
 
 _file_location = Path(__file__).resolve()
 _fig_path = _file_location.parents[1] / "figures"
@@ -27,19 +32,54 @@ _fig_path = _file_location.parents[1] / "figures"
 
 @dataclass
 class Plot:
-    f: np.ndarray = field(repr=False)
+    f: Optional[np.ndarray] = field(repr=False)
     L: int
     filename: str
     plot_type: str = field(default="real", repr=False)
+    # the harmonic coefficients, if given these are used rather than f
+    flm: Optional[np.ndarray] = field(default=None, repr=False)
+    reality: bool = field(default=False, repr=False)
 
     def __post_init__(self) -> None:
         self.resolution = calc_plot_resolution(self.L)
 
+    @classmethod
+    def from_flm(
+        cls,
+        flm: np.ndarray,
+        L: int,
+        filename: str,
+        plot_type: str = "real",
+        reality: bool = False,
+    ) -> "Plot":
+        """Plots a signal from its harmonic coefficients, which are taken
+        straight to the boosted grid rather than via the pixels at L
+
+        Args:
+            flm (np.ndarray): the harmonic coefficients of the signal
+            L (int): bandlimit of the signal
+            filename (str): the name of the HTML file
+            plot_type (str, optional): one of abs/imag/real/sum.
+            Defaults to "real".
+            reality (bool, optional): whether the signal is real.
+            Defaults to False.
+
+        Returns:
+            Plot: the plot of the signal
+        """
+        return cls(None, L, filename, plot_type, flm=flm, reality=reality)
+
+    @instrumentation.timed("Plot.execute")
     def execute(self) -> None:
         """Perfoms the plotly plot using a 3D surface
         the plot will open in a browser as a HTML
         """
-        f = self._prepare_field(self.f)
+        # plotly is slow to import so only do so once a plot is made
+        import plotly.offline as py
+        from plotly.graph_objs import Figure, Surface
+        from plotly.graph_objs.surface import Lighting
+
+        f = self._prepare_field()
 
         # get values from the setup
         x, y, z, f_plot, vmin, vmax = self._setup_plot(f, self.resolution)
@@ -113,9 +153,9 @@ class Plot:
             else:
                 f, _, _ = f
 
-        # generate samples
-        thetas, phis = ssht.sample_positions(resolution, Grid=True, Method=method)
-        if thetas.size != f.size:
+        # the samples are shared by every plot at this resolution
+        thetas, phis, x, y, z = sphere_mesh(resolution, method, close)
+        if np.prod(ssht.sample_shape(resolution, Method=method)) != f.size:
             raise ValueError("Bandlimit L deos not match that of f")
 
         # find colour range of plot
@@ -150,25 +190,75 @@ class Plot:
                 f_normalised = np.insert(
                     f_normalised, n_phi, f_normalised[:, first_row], axis=phi_index
                 )
-            thetas = np.insert(thetas, n_phi, thetas[:, first_row], axis=phi_index)
-            phis = np.insert(phis, n_phi, phis[:, first_row], axis=phi_index)
 
         # Compute location of vertices.
-        x, y, z = (
-            ssht.spherical_to_cart(f_normalised, thetas, phis)
-            if parametric
-            else ssht.s2_to_cart(thetas, phis)
-        )
+        if parametric:
+            x, y, z = ssht.spherical_to_cart(f_normalised, thetas, phis)
         return x, y, z, f_plot, vmin, vmax
 
-    def _prepare_field(self, f: np.ndarray) -> np.ndarray:
+    def _prepare_field(self) -> np.ndarray:
         """Boosts and calculates the plot type before plotting
 
-        Args:
-            f (np.ndarray): the pixel values of the signal
+        Raises:
+            ValueError: if neither the pixels nor the harmonic coefficients
+            of the signal are given
 
         Returns:
             np.ndarray: boosted and i.e. 'real' part of signal
         """
-        boosted_field = boost_field(f, self.L, self.resolution)
+        if self.flm is not None:
+            # straight from the coefficients to the boosted grid
+            boosted_field = invert_flm_boosted(
+                self.flm.astype(np.complex_, copy=False),
+                self.L,
+                self.resolution,
+                reality=self.reality,
+            )
+        elif self.f is not None:
+            boosted_field = boost_field(self.f, self.L, self.resolution)
+        else:
+            raise ValueError("either f or flm is needed to plot")
         return create_plot_type(boosted_field, self.plot_type)
+
+
+def plot_flms(
+    L: int,
+    flms: dict[str, np.ndarray],
+    plot_type: str,
+    reality: bool = False,
+    workers: int = WORKERS_DEFAULT,
+) -> None:
+    """Plots each signal from its harmonic coefficients
+
+    Args:
+        L (int): bandlimit of the signals
+        flms (dict[str, np.ndarray]): the harmonic coefficients by filename
+        plot_type (str): one of abs/imag/real/sum
+        reality (bool, optional): whether the signals are real. Defaults to
+        False.
+        workers (int, optional): the number of plots to render concurrently,
+        each process builds the sphere mesh once. Defaults to WORKERS_DEFAULT.
+    """
+    plot_flm = partial(_plot_flm, L, plot_type, reality)
+    if workers == 1:
+        for item in flms.items():
+            plot_flm(item)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            list(executor.map(plot_flm, flms.items()))
+
+
+def _plot_flm(
+    L: int, plot_type: str, reality: bool, item: tuple[str, np.ndarray]
+) -> None:
+    """Plots a single signal from its harmonic coefficients
+
+    Args:
+        L (int): bandlimit of the signal
+        plot_type (str): one of abs/imag/real/sum
+        reality (bool): whether the signal is real
+        item (tuple[str, np.ndarray]): the filename and harmonic coefficients
+    """
+    name, flm = item
+    logger.info("producing the '%s' plot", name)
+    Plot.from_flm(flm, L, name, plot_type=plot_type, reality=reality).execute()
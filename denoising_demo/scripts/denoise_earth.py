@@ -1,11 +1,18 @@
-import pyssht as ssht
-
 from denoising_demo.data.create_earth_flm import create_flm
-from denoising_demo.plotting.create_plot_sphere import Plot
-from denoising_demo.utils.cli import read_args
-from denoising_demo.utils.denoising import perform_denoising
+from denoising_demo.plotting.create_plot_sphere import plot_flms
+from denoising_demo.utils.cli import read_args, setup_logging
+from denoising_demo.utils.denoising import (
+    compare_precision,
+    perform_denoising,
+    perform_streaming_denoising,
+)
+from denoising_demo.utils.instrumentation import instrumentation
 from denoising_demo.utils.logger import logger
 from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.results import DenoisingResults
+from denoising_demo.utils.thresholding import create_thresholding_strategy
+from denoising_demo.utils.tiling_cache import tiling_cache
+from denoising_demo.utils.vars import PRECISIONS
 from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
 
 
@@ -13,42 +20,106 @@ def main() -> None:
     """Performs a denoising akin to figure 5 of the S2LET paper"""
     # read in command line arguments
     args = read_args()
+    setup_logging(args)
+    if args.instrument is not None:
+        instrumentation.enabled = True
+        instrumentation.trace_memory = args.trace_memory
     logger.info(
-        f"parameters: L={args.bandlimit}, J0={args.jmin}, "
-        f"B={args.parameter}, SNR_IN={args.noise}, N_SIGMA={args.sigma}"
+        "parameters: L=%d, J0=%d, B=%d, SNR_IN=%d, N_SIGMA=%d",
+        args.bandlimit,
+        args.jmin,
+        args.parameter,
+        args.noise,
+        args.sigma,
     )
 
     # create initial smoothed Earth topography
     earth_flm = create_flm(args.bandlimit)
 
     # compute harmonic coefficients of the noise to create noised signal
-    nlm = create_noise(args.bandlimit, earth_flm, args.noise)
-    compute_snr(earth_flm, nlm)
+    dtype = PRECISIONS[args.precision]
+    nlm = create_noise(args.bandlimit, earth_flm, args.noise, dtype=dtype)
+    noised_snr = float(compute_snr(earth_flm, nlm))
     noised_earth_flm = earth_flm + nlm
 
     # create axisymmetric wavelets for hard-thresholding
-    wavelets = create_axisymmetric_wavelets(args.bandlimit, args.parameter, args.jmin)
+    if args.cache_dir is not None:
+        tiling_cache.directory = args.cache_dir
+    wavelets = create_axisymmetric_wavelets(
+        args.bandlimit, args.parameter, args.jmin, dtype=dtype
+    )
 
     # denoise Earth signal
-    denoised_earth_flm = perform_denoising(
-        args.bandlimit, earth_flm, noised_earth_flm, wavelets, args.noise, args.sigma
+    strategy = create_thresholding_strategy(args.threshold)
+    if args.streaming:
+        denoised_earth_flm = perform_streaming_denoising(
+            args.bandlimit,
+            None if args.estimate_noise else earth_flm,
+            noised_earth_flm,
+            wavelets,
+            args.noise,
+            args.sigma,
+            band_limited=args.band_limited,
+            strategy=strategy,
+            reality=args.real,
+        )
+    else:
+        denoised_earth_flm = perform_denoising(
+            args.bandlimit,
+            None if args.estimate_noise else earth_flm,
+            noised_earth_flm,
+            wavelets,
+            args.noise,
+            args.sigma,
+            workers=args.workers,
+            band_limited=args.band_limited,
+            strategy=strategy,
+            reality=args.real,
+        )
+    # the pipeline has logged the SNR unless the noise level was estimated
+    denoised_snr = float(
+        compute_snr(earth_flm, denoised_earth_flm - earth_flm, log=args.estimate_noise)
     )
+    if args.check_precision:
+        compare_precision(
+            args.bandlimit,
+            earth_flm,
+            noised_earth_flm,
+            wavelets,
+            args.noise,
+            args.sigma,
+            band_limited=args.band_limited,
+            strategy=strategy,
+            reality=args.real,
+        )
 
-    # create dict to loop over
-    fields_dict = {
-        "earth": earth_flm,
-        "noised_earth": noised_earth_flm,
-        "denoised_earth": denoised_earth_flm,
-    }
+    results = DenoisingResults(
+        args.bandlimit,
+        flms=dict(
+            earth=earth_flm,
+            noised_earth=noised_earth_flm,
+            denoised_earth=denoised_earth_flm,
+        ),
+        snrs=dict(noised_earth=noised_snr, denoised_earth=denoised_snr),
+        parameters=vars(args),
+    )
+    if args.output is not None:
+        results.save(args.output)
+        logger.info("written results to '%s'", args.output)
 
     # produce three plots
-    for name, flm in fields_dict.items():
-        # convert to pixel space
-        field = ssht.inverse(flm, args.bandlimit)
+    if not args.no_plot:
+        plot_flms(
+            args.bandlimit,
+            results.flms,
+            args.type,
+            reality=args.real,
+            workers=args.plot_workers,
+        )
 
-        # perform plot
-        logger.info(f"producing the '{name}' plot")
-        Plot(field, args.bandlimit, name, plot_type=args.type).execute()
+    if args.instrument is not None:
+        instrumentation.write_summary(args.instrument)
+        logger.info("written instrumentation to %s", args.instrument)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+from denoising_demo.data.create_earth_flm import create_flm
+from denoising_demo.utils.cli import read_monte_carlo_args, setup_logging
+from denoising_demo.utils.logger import logger
+from denoising_demo.utils.monte_carlo import run_monte_carlo
+from denoising_demo.utils.tiling_cache import tiling_cache
+from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
+
+
+def main() -> None:
+    """Estimates the output SNR of the denoising over noise realisations"""
+    # read in command line arguments
+    args = read_monte_carlo_args()
+    setup_logging(args)
+    logger.info(
+        "parameters: L=%d, J0=%d, B=%d, SNR_IN=%d, N_SIGMA=%d, N=%d",
+        args.bandlimit,
+        args.jmin,
+        args.parameter,
+        args.noise,
+        args.sigma,
+        args.realisations,
+    )
+    if args.cache_dir is not None:
+        tiling_cache.directory = args.cache_dir
+
+    # create initial smoothed Earth topography
+    earth_flm = create_flm(args.bandlimit)
+
+    # create axisymmetric wavelets for hard-thresholding
+    wavelets = create_axisymmetric_wavelets(args.bandlimit, args.parameter, args.jmin)
+
+    # denoise many noise realisations
+    result = run_monte_carlo(
+        args.bandlimit,
+        earth_flm,
+        wavelets,
+        args.noise,
+        args.sigma,
+        args.realisations,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint=args.checkpoint,
+    )
+    logger.info(
+        "SNR: %.2f +/- %.2f, retained fraction per scale: %s",
+        result.snr_out.mean,
+        result.snr_out.standard_error,
+        result.retained_fraction.mean.round(3),
+    )
+
+
+if __name__ == "__main__":
+    main()
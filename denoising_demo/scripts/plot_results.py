@@ -0,0 +1,29 @@
+from denoising_demo.plotting.create_plot_sphere import plot_flms
+from denoising_demo.utils.cli import read_plot_args, setup_logging
+from denoising_demo.utils.logger import logger
+from denoising_demo.utils.results import DenoisingResults
+
+
+def main() -> None:
+    """Plots the harmonic coefficients saved by a headless denoising run"""
+    # read in command line arguments
+    args = read_plot_args()
+    setup_logging(args)
+
+    # read the results of the run
+    results = DenoisingResults.load(args.input)
+    for name, snr in results.snrs.items():
+        logger.info("'%s' SNR: %.2f", name, snr)
+
+    # produce the plots
+    plot_flms(
+        results.L,
+        results.flms,
+        args.type,
+        reality=results.parameters.get("real", False),
+        workers=args.plot_workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from denoising_demo.data.create_earth_flm import create_flm
+from denoising_demo.utils.cli import read_sweep_args, setup_logging
+from denoising_demo.utils.logger import logger
+from denoising_demo.utils.sweep import run_sweep, write_results
+from denoising_demo.utils.tiling_cache import tiling_cache
+
+
+def main() -> None:
+    """Denoises the Earth topography over a grid of parameters"""
+    # read in command line arguments
+    args = read_sweep_args()
+    setup_logging(args)
+    logger.info(
+        "sweep: L=%d, J0=%s, B=%s, SNR_IN=%s, N_SIGMA=%s",
+        args.bandlimit,
+        args.jmin,
+        args.parameter,
+        args.noise,
+        args.sigma,
+    )
+    if args.cache_dir is not None:
+        tiling_cache.directory = args.cache_dir
+
+    # create initial smoothed Earth topography
+    earth_flm = create_flm(args.bandlimit)
+
+    # denoise over the grid
+    results = run_sweep(
+        args.bandlimit,
+        earth_flm,
+        args.noise,
+        args.sigma,
+        args.parameter,
+        args.jmin,
+        band_limited=args.band_limited,
+    )
+    write_results(results, args.output)
+    logger.info("written %d results to '%s'", len(results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import numpy as np
+import pyssht as ssht
+
+
+def loop_wavelet_forward(L: int, flm: np.ndarray, wavelets: np.ndarray) -> np.ndarray:
+    """The reference per-(ell, m) implementation of the forward transform
+
+    Args:
+        L (int): bandlimit of signal
+        flm (np.ndarray): harmonic coefficients of the signal
+        wavelets (np.ndarray): the axisymmetric wavelets
+
+    Returns:
+        np.ndarray: the wavelet coefficients of the signal
+    """
+    w = np.zeros(wavelets.shape, dtype=np.complex_)
+    for ell in range(L):
+        ind_m0 = ssht.elm2ind(ell, 0)
+        wav_0 = np.sqrt((4 * np.pi) / (2 * ell + 1)) * wavelets[:, ind_m0].conj()
+        for m in range(-ell, ell + 1):
+            ind = ssht.elm2ind(ell, m)
+            w[:, ind] = wav_0 * flm[ind]
+    return w
+
+
+def loop_wavelet_inverse(
+    L: int, wav_coeffs: np.ndarray, wavelets: np.ndarray
+) -> np.ndarray:
+    """The reference per-(ell, m) implementation of the inverse transform
+
+    Args:
+        L (int): bandlimit of the signal
+        wav_coeffs (np.ndarray): the wavelet coefficients
+        wavelets (np.ndarray): axisymmetric wavelets
+
+    Returns:
+        np.ndarray: the signal reconstructed from its wavelet coefficients
+    """
+    flm = np.zeros(L ** 2, dtype=np.complex_)
+    for ell in range(L):
+        ind_m0 = ssht.elm2ind(ell, 0)
+        wav_0 = np.sqrt((4 * np.pi) / (2 * ell + 1)) * wavelets[:, ind_m0]
+        for m in range(-ell, ell + 1):
+            ind = ssht.elm2ind(ell, m)
+            flm[ind] = (wav_coeffs[:, ind] * wav_0).sum()
+    return flm
@@ -0,0 +1,66 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Barrier
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_equal
+from scipy import io as sio
+
+from denoising_demo.data import create_earth_flm
+from denoising_demo.test.constants import L_LARGE, L_SMALL
+
+
+def test_flm_cache_is_rebuilt_when_source_changes(monkeypatch, tmp_path) -> None:
+    """tests the memory-mapped cache follows changes to the MATLAB binary"""
+    matfile = tmp_path / "flms.mat"
+    monkeypatch.setattr(create_earth_flm, "_matfile", matfile)
+    monkeypatch.setattr(create_earth_flm, "_cachefile", matfile.with_suffix(".npy"))
+    monkeypatch.setattr(create_earth_flm, "_keyfile", matfile.with_suffix(".key"))
+
+    flm = np.arange(L_SMALL ** 2, dtype=np.complex_)
+    sio.savemat(str(matfile), dict(flm=flm[:, np.newaxis]))
+    cached = create_earth_flm._load_flm()
+    assert isinstance(cached, np.memmap)
+    assert_equal(cached, flm)
+
+    flm = np.arange(L_LARGE ** 2, dtype=np.complex_)
+    sio.savemat(str(matfile), dict(flm=flm[:, np.newaxis]))
+    assert_equal(create_earth_flm._load_flm(), flm)
+
+
+def _start_together(barrier) -> None:
+    """Sets up a worker so every process has written its conversion before
+    any moves it into place, the worst case for concurrent cold starts
+    """
+    save = np.save
+
+    def save_then_wait(*args, **kwargs) -> None:
+        save(*args, **kwargs)
+        barrier.wait()
+
+    create_earth_flm.np.save = save_then_wait
+
+
+def _load_from(matfile: Path) -> np.ndarray:
+    """Loads the coefficients of a MATLAB binary in a worker process"""
+    create_earth_flm._matfile = matfile
+    create_earth_flm._cachefile = matfile.with_suffix(".npy")
+    create_earth_flm._keyfile = matfile.with_suffix(".key")
+    return np.array(create_earth_flm._load_flm())
+
+
+def test_concurrent_cold_loads(tmp_path) -> None:
+    """tests processes building the cache at the same time all succeed"""
+    n_processes = 4
+    matfile = tmp_path / "flms.mat"
+    flm = np.arange(L_LARGE ** 2, dtype=np.complex_)
+    sio.savemat(str(matfile), dict(flm=flm[:, np.newaxis]))
+    with ProcessPoolExecutor(
+        n_processes, initializer=_start_together, initargs=(Barrier(n_processes),)
+    ) as executor:
+        for cached in executor.map(_load_from, [matfile] * n_processes):
+            assert_equal(cached, flm)
+    assert_equal(
+        sorted(path.name for path in tmp_path.iterdir()),
+        ["flms.key", "flms.mat", "flms.npy"],
+    )
@@ -1,10 +1,15 @@
+import numpy as np
 import pyssht as ssht
-from numpy.testing import assert_equal
+from numpy.testing import assert_allclose, assert_equal
 
 from denoising_demo.test.constants import L_LARGE, L_SMALL
+from denoising_demo.utils.harmonic_index import harmonic_index, n_coefficients
 from denoising_demo.utils.harmonic_methods import (
     boost_coefficient_resolution,
+    fill_negative_m,
     invert_flm_boosted,
+    to_full_spectrum,
+    to_half_spectrum,
 )
 
 
@@ -24,3 +29,36 @@ def test_invert_flm_and_boost(random_flm) -> None:
     n_theta, n_phi = ssht.sample_shape(L_LARGE)
     f = invert_flm_boosted(random_flm, L_SMALL, L_LARGE)
     assert_equal(f.shape, (n_theta, n_phi))
+
+
+def test_fill_negative_m_gives_real_signal(random_flm) -> None:
+    """
+    tests that filling in the negative m of a signal makes it real
+    """
+    flm = fill_negative_m(random_flm.copy(), L_SMALL)
+    ind_m0 = harmonic_index(L_SMALL).m0
+    flm[ind_m0] = flm[ind_m0].real
+    assert_allclose(ssht.inverse(flm, L_SMALL).imag, 0, atol=1e-14)
+
+
+def test_harmonic_index_matches_ssht() -> None:
+    """
+    tests the cached index tables agree with ssht.elm2ind
+    """
+    index = harmonic_index(L_SMALL)
+    assert harmonic_index(L_SMALL) is index
+    for ind in range(L_SMALL ** 2):
+        ell, m = ssht.ind2elm(ind)
+        assert_equal((index.ell[ind], index.m[ind]), (ell, m))
+    for ell in range(L_SMALL):
+        assert_equal(index.m[index.ell_slice(ell)], np.arange(-ell, ell + 1))
+    assert_equal(index.m0, [ssht.elm2ind(ell, 0) for ell in range(L_SMALL)])
+    assert_equal(index.m[index.neg_m], -index.m[index.pos_m])
+
+
+def test_half_spectrum_round_trip(random_flm) -> None:
+    """tests the m>=0 half-spectrum of a real signal recovers every m"""
+    fill_negative_m(random_flm, L_SMALL)
+    flm_half = to_half_spectrum(random_flm, L_SMALL)
+    assert_equal(flm_half.shape, (n_coefficients(L_SMALL, reality=True),))
+    assert_allclose(to_full_spectrum(flm_half, L_SMALL), random_flm)
@@ -0,0 +1,9 @@
+from numpy.testing import assert_equal
+
+from denoising_demo.benchmarks.benchmark_import_time import imported_dependencies
+
+
+def test_scripts_import_heavy_dependencies_lazily() -> None:
+    """tests plotly, scipy.io and pys2let are not imported by the CLI"""
+    for script in ["denoise_earth", "sweep", "monte_carlo"]:
+        assert_equal(imported_dependencies(f"denoising_demo.scripts.{script}"), [])
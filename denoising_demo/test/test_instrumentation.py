@@ -0,0 +1,45 @@
+from numpy.testing import assert_array_less, assert_equal
+
+from denoising_demo.test.constants import L_SMALL, N_SIGMA, SNR_IN
+from denoising_demo.utils.denoising import perform_denoising
+from denoising_demo.utils.instrumentation import instrumentation
+from denoising_demo.utils.noise import create_noise
+
+
+def test_instrumentation_of_denoising(
+    earth, axisymmetric_wavelets, monkeypatch
+) -> None:
+    """tests the nested stages are timed and the transforms counted"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    monkeypatch.setattr(instrumentation, "trace_memory", True)
+    instrumentation.reset()
+    try:
+        perform_denoising(
+            L_SMALL, earth, earth + nlm, axisymmetric_wavelets, SNR_IN, N_SIGMA
+        )
+        summary = instrumentation.summary()
+    finally:
+        instrumentation.reset()
+    stages = summary["stages"]
+    assert_equal(stages["perform_denoising"]["calls"], 1)
+    assert_array_less(
+        stages["harmonic_hard_thresholding"]["seconds"],
+        stages["perform_denoising"]["seconds"],
+    )
+    assert_array_less(
+        stages["axisymmetric_wavelet_forward"]["peak_bytes"],
+        stages["perform_denoising"]["peak_bytes"] + 1,
+    )
+    assert_equal(
+        summary["counters"]["ssht_inverse"], axisymmetric_wavelets.n_scales - 1
+    )
+
+
+def test_instrumentation_disabled_records_nothing(earth, axisymmetric_wavelets) -> None:
+    """tests nothing is measured when disabled"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    perform_denoising(
+        L_SMALL, earth, earth + nlm, axisymmetric_wavelets, SNR_IN, N_SIGMA
+    )
+    assert_equal(instrumentation.summary(), dict(stages={}, counters={}))
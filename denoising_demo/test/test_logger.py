@@ -0,0 +1,52 @@
+import json
+import logging
+from argparse import ArgumentTypeError
+
+import pytest
+from numpy.testing import assert_equal
+
+from denoising_demo.test.constants import L_SMALL, SNR_IN
+from denoising_demo.utils.cli import module_level
+from denoising_demo.utils.logger import configure_logging, logger
+from denoising_demo.utils.noise import compute_snr, create_noise
+
+
+@pytest.fixture
+def restore_logging():
+    """Restores the package logger after the test reconfigures it"""
+    handlers, propagate, level = logger.handlers, logger.propagate, logger.level
+    noise_logger = logging.getLogger("denoising_demo.utils.noise")
+    noise_level = noise_logger.level
+    yield
+    logger.handlers, logger.propagate = handlers, propagate
+    logger.setLevel(level)
+    noise_logger.setLevel(noise_level)
+
+
+def test_json_lines_carry_run_parameters(earth, capsys, restore_logging) -> None:
+    """tests each record is a line of JSON with the run parameters"""
+    configure_logging(json_lines=True, parameters=dict(L=L_SMALL))
+    compute_snr(earth, create_noise(L_SMALL, earth, SNR_IN))
+    record = json.loads(capsys.readouterr().err.splitlines()[-1])
+    assert_equal(record["logger"], "denoising_demo.utils.noise")
+    assert record["message"].startswith("SNR")
+    assert_equal(record["run"], dict(L=L_SMALL))
+
+
+def test_quiet_and_module_levels(earth, capsys, restore_logging) -> None:
+    """tests quiet mode drops info unless a module level overrides it"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    configure_logging(quiet=True)
+    compute_snr(earth, nlm)
+    assert_equal(capsys.readouterr().err, "")
+    configure_logging(quiet=True, module_levels={"utils.noise": "INFO"})
+    compute_snr(earth, nlm)
+    assert "SNR" in capsys.readouterr().err
+
+
+def test_module_level_parsing() -> None:
+    """tests module levels parse as NAME=LEVEL and malformed ones are refused"""
+    assert_equal(module_level("utils.noise=debug"), ("utils.noise", "DEBUG"))
+    for setting in ["utils.noise", "utils.noise=LOUD", "=DEBUG"]:
+        with pytest.raises(ArgumentTypeError):
+            module_level(setting)
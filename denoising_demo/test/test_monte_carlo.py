@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from denoising_demo.test.constants import L_SMALL, N_SIGMA, SNR_IN
+from denoising_demo.utils import monte_carlo
+from denoising_demo.utils.monte_carlo import RunningStatistics, run_monte_carlo
+
+
+def test_running_statistics_match_numpy() -> None:
+    """tests the streamed statistics match those of all samples at once"""
+    values = np.random.default_rng(0).standard_normal((10, 3))
+    stats = RunningStatistics()
+    for batch in np.split(values, [3, 4, 8]):
+        stats.update(batch)
+    assert_equal(stats.count, 10)
+    assert_allclose(stats.mean, values.mean(axis=0))
+    assert_allclose(stats.variance, values.var(axis=0, ddof=1))
+
+
+def test_monte_carlo_resumes_from_checkpoint(
+    earth, axisymmetric_wavelets, tmp_path, monkeypatch
+) -> None:
+    """tests a run resumed from a checkpoint matches an uninterrupted one,
+    and that the checkpoint of a different run is refused
+    """
+    checkpoint = tmp_path / "checkpoint.npz"
+    args = (L_SMALL, earth, axisymmetric_wavelets, SNR_IN, N_SIGMA)
+    full = run_monte_carlo(*args, 6, batch_size=2)
+
+    # interrupt the run after the second batch
+    save_checkpoint = monte_carlo._save_checkpoint
+
+    def interrupt(*checkpoint_args) -> None:
+        save_checkpoint(*checkpoint_args)
+        if checkpoint_args[-1] == 2:
+            raise InterruptedError
+
+    monkeypatch.setattr(monte_carlo, "_save_checkpoint", interrupt)
+    with pytest.raises(InterruptedError):
+        run_monte_carlo(*args, 6, batch_size=2, checkpoint=checkpoint)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        run_monte_carlo(*args, 8, batch_size=2, checkpoint=checkpoint)
+    resumed = run_monte_carlo(*args, 6, batch_size=2, checkpoint=checkpoint)
+    assert_equal(resumed.snr_out.count, 6)
+    assert_allclose(resumed.snr_out.mean, full.snr_out.mean)
+    assert_allclose(resumed.retained_fraction.m2, full.retained_fraction.m2)
@@ -1,8 +1,24 @@
-from numpy.testing import assert_array_less
+import numpy as np
+import pyssht as ssht
+from numpy.testing import assert_allclose, assert_array_less, assert_equal
 
 from denoising_demo.test.constants import J_MIN, L_SMALL, N_SIGMA, SNR_IN, B
-from denoising_demo.utils.denoising import perform_denoising
-from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.denoising import (
+    compare_precision,
+    perform_denoising,
+    perform_multi_threshold_denoising,
+    perform_streaming_denoising,
+)
+from denoising_demo.utils.harmonic_methods import to_full_spectrum
+from denoising_demo.utils.noise import (
+    batched_hard_thresholding,
+    compute_sigma_j,
+    compute_snr,
+    create_noise,
+    estimate_sigma_j,
+    harmonic_hard_thresholding,
+)
+from denoising_demo.utils.vars import RANDOM_SEED
 from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
 
 
@@ -24,3 +40,173 @@ def test_denoising_earth_axisymmetric_wavelets(earth) -> None:
 
     # check for SNR boost
     assert_array_less(noised_snr, denoised_snr)
+
+
+def test_noise_is_real_and_seed_stable(earth) -> None:
+    """tests the noise is a real field and is reproducible from a seed"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN, rng=RANDOM_SEED)
+    assert_allclose(ssht.inverse(nlm, L_SMALL).imag, 0, atol=1e-12)
+    assert_equal(nlm, create_noise(L_SMALL, earth, SNR_IN))
+
+
+def test_noise_realisations_are_independent(earth) -> None:
+    """tests that a stack of noise realisations has the right shape"""
+    n_realisations = 4
+    nlm = create_noise(L_SMALL, earth, SNR_IN, n_realisations=n_realisations)
+    assert_equal(nlm.shape, (n_realisations, L_SMALL ** 2))
+    assert_equal(nlm[0], create_noise(L_SMALL, earth, SNR_IN))
+    assert not np.allclose(nlm[0], nlm[1])
+
+
+def test_batched_thresholding_matches_single_map(earth, axisymmetric_wavelets) -> None:
+    """tests thresholding a stack of maps matches thresholding each map"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN, n_realisations=2)
+    w = axisymmetric_wavelets.forward(earth + nlm[:, np.newaxis])
+    sigma_j = compute_sigma_j(earth, axisymmetric_wavelets, SNR_IN)
+    w_batched = batched_hard_thresholding(L_SMALL, w, sigma_j, N_SIGMA)
+    for w_k, w_batched_k in zip(w, w_batched):
+        assert_equal(
+            harmonic_hard_thresholding(L_SMALL, w_k.copy(), sigma_j, N_SIGMA),
+            w_batched_k,
+        )
+
+
+def test_parallel_thresholding_matches_serial(earth, axisymmetric_wavelets) -> None:
+    """tests thresholding the scales in parallel gives the serial result"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    w = axisymmetric_wavelets.forward(earth + nlm)
+    sigma_j = compute_sigma_j(earth, axisymmetric_wavelets, SNR_IN)
+    assert_equal(
+        batched_hard_thresholding(L_SMALL, w, sigma_j, N_SIGMA, workers=2),
+        batched_hard_thresholding(L_SMALL, w, sigma_j, N_SIGMA),
+    )
+
+
+def test_band_limited_denoising(earth) -> None:
+    """tests thresholding each scale at its own bandlimit improves the SNR"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    noised_snr = compute_snr(earth, nlm)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
+    denoised_earth_flm = perform_denoising(
+        L_SMALL, earth, earth + nlm, wavelets, SNR_IN, N_SIGMA, band_limited=True
+    )
+    assert_array_less(noised_snr, compute_snr(earth, denoised_earth_flm - earth))
+
+
+def test_multi_threshold_denoising(earth) -> None:
+    """tests denoising at several levels at once matches one level at a time"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
+    n_sigmas = [N_SIGMA - 1, N_SIGMA]
+    flms = perform_multi_threshold_denoising(
+        L_SMALL, earth, earth + nlm, wavelets, SNR_IN, n_sigmas
+    )
+    for n_sigma, flm in zip(n_sigmas, flms):
+        assert_allclose(
+            flm,
+            perform_denoising(L_SMALL, earth, earth + nlm, wavelets, SNR_IN, n_sigma),
+        )
+
+
+def test_thresholding_skips_whole_scales(
+    earth, axisymmetric_wavelets, monkeypatch
+) -> None:
+    """tests scales kept or removed whole skip the pixel-space round trip"""
+    w = axisymmetric_wavelets.forward(earth)
+    sigma_j = compute_sigma_j(earth, axisymmetric_wavelets, SNR_IN)
+    monkeypatch.setattr(ssht, "inverse", None)
+    assert_equal(batched_hard_thresholding(L_SMALL, w, sigma_j, 0), w)
+    assert_equal(batched_hard_thresholding(L_SMALL, w, sigma_j, 10 ** 20)[1:], 0)
+
+
+def test_estimated_sigma_j(earth, axisymmetric_wavelets) -> None:
+    """tests the noise level estimated from a noise-only map is close to the
+    level computed from the signal
+    """
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    w = axisymmetric_wavelets.forward(nlm)
+    assert_allclose(
+        estimate_sigma_j(L_SMALL, w, axisymmetric_wavelets),
+        compute_sigma_j(earth, axisymmetric_wavelets, SNR_IN),
+        rtol=0.2,
+    )
+
+
+def test_denoising_without_the_signal(earth, axisymmetric_wavelets) -> None:
+    """tests denoising with an estimated noise level improves the SNR"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    denoised_earth_flm = perform_denoising(
+        L_SMALL, None, earth + nlm, axisymmetric_wavelets, SNR_IN, N_SIGMA
+    )
+    assert_array_less(
+        compute_snr(earth, nlm), compute_snr(earth, denoised_earth_flm - earth)
+    )
+
+
+def test_streaming_denoising_matches(earth, axisymmetric_wavelets) -> None:
+    """tests denoising one scale at a time matches the full pipeline"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    for signal in [earth, None]:
+        for band_limited in [False, True]:
+            assert_allclose(
+                perform_streaming_denoising(
+                    L_SMALL,
+                    signal,
+                    earth + nlm,
+                    axisymmetric_wavelets,
+                    SNR_IN,
+                    N_SIGMA,
+                    band_limited=band_limited,
+                ),
+                perform_denoising(
+                    L_SMALL,
+                    signal,
+                    earth + nlm,
+                    axisymmetric_wavelets,
+                    SNR_IN,
+                    N_SIGMA,
+                    band_limited=band_limited,
+                ),
+                atol=1e-12,
+            )
+
+
+def test_real_signal_denoising_matches(earth, axisymmetric_wavelets) -> None:
+    """tests the half-spectrum of the real-field mode matches every m"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    assert_allclose(
+        to_full_spectrum(create_noise(L_SMALL, earth, SNR_IN, reality=True), L_SMALL),
+        nlm,
+    )
+    for denoise in [perform_denoising, perform_streaming_denoising]:
+        for signal in [earth, None]:
+            assert_allclose(
+                denoise(
+                    L_SMALL,
+                    signal,
+                    earth + nlm,
+                    axisymmetric_wavelets,
+                    SNR_IN,
+                    N_SIGMA,
+                    reality=True,
+                ),
+                denoise(
+                    L_SMALL, signal, earth + nlm, axisymmetric_wavelets, SNR_IN, N_SIGMA
+                ),
+                atol=1e-10,
+            )
+
+
+def test_single_precision_denoising(earth) -> None:
+    """tests single precision keeps its dtype and matches the double SNR"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN, dtype=np.complex64)
+    assert_equal(nlm.dtype, np.complex64)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN, dtype=np.complex64)
+    denoised_earth_flm = perform_denoising(
+        L_SMALL, earth, earth + nlm, wavelets, SNR_IN, N_SIGMA
+    )
+    assert_equal(denoised_earth_flm.dtype, np.complex64)
+    deviation = compare_precision(
+        L_SMALL, earth, earth + nlm, wavelets, SNR_IN, N_SIGMA
+    )
+    assert_allclose(deviation, 0, atol=1e-3)
@@ -0,0 +1,29 @@
+import pyssht as ssht
+from numpy.testing import assert_allclose, assert_equal
+
+from denoising_demo.plotting.create_plot_sphere import Plot
+from denoising_demo.test.constants import L_SMALL
+from denoising_demo.utils.plot_methods import sphere_mesh
+
+
+def test_sphere_mesh_cached() -> None:
+    """tests the mesh is only computed once per resolution"""
+    assert sphere_mesh(L_SMALL) is sphere_mesh(L_SMALL)
+
+
+def test_plot_from_flm_matches_field(earth) -> None:
+    """tests boosting straight from the coefficients matches the pixels"""
+    field = ssht.inverse(earth, L_SMALL)
+    from_field = Plot(field, L_SMALL, "earth")
+    from_flm = Plot.from_flm(earth, L_SMALL, "earth")
+    assert_allclose(from_flm._prepare_field(), from_field._prepare_field(), atol=1e-10)
+
+
+def test_setup_plot_closes_samples(earth) -> None:
+    """tests the closed plot has an extra column of samples"""
+    plot = Plot.from_flm(earth, L_SMALL, "earth")
+    f = plot._prepare_field()
+    x, y, z, f_plot, _, _ = Plot._setup_plot(f, plot.resolution)
+    n_theta, n_phi = f.shape
+    for array in [x, y, z, f_plot]:
+        assert_equal(array.shape, (n_theta, n_phi + 1))
@@ -0,0 +1,24 @@
+from numpy.testing import assert_allclose, assert_equal
+
+from denoising_demo.test.constants import L_SMALL, SNR_IN
+from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.results import DenoisingResults
+
+
+def test_results_round_trip(earth, tmp_path) -> None:
+    """tests the saved coefficients, SNRs and parameters are read back"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    results = DenoisingResults(
+        L_SMALL,
+        flms=dict(earth=earth, noised_earth=earth + nlm),
+        snrs=dict(noised_earth=float(compute_snr(earth, nlm))),
+        parameters=dict(noise=SNR_IN, output=tmp_path),
+    )
+    path = tmp_path / "results.npz"
+    results.save(path)
+    loaded = DenoisingResults.load(path)
+    assert_equal(loaded.L, L_SMALL)
+    for name, flm in results.flms.items():
+        assert_allclose(loaded.flms[name], flm)
+    assert_allclose(loaded.snrs["noised_earth"], results.snrs["noised_earth"])
+    assert_equal(loaded.parameters, dict(noise=SNR_IN, output=str(tmp_path)))
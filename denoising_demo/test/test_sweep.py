@@ -0,0 +1,23 @@
+from numpy.testing import assert_allclose, assert_equal
+
+from denoising_demo.test.constants import J_MIN, L_SMALL, N_SIGMA, SNR_IN, B
+from denoising_demo.utils.denoising import perform_denoising
+from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.sweep import run_sweep, write_results
+from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
+
+
+def test_sweep_matches_single_runs(earth, tmp_path) -> None:
+    """tests the shared work of a sweep gives the same SNRs as single runs"""
+    n_sigmas = [N_SIGMA - 1, N_SIGMA]
+    results = run_sweep(L_SMALL, earth, [SNR_IN], n_sigmas, [B], [J_MIN, J_MIN + 1])
+    assert_equal(len(results), 4)
+
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
+    denoised = perform_denoising(L_SMALL, earth, earth + nlm, wavelets, SNR_IN, N_SIGMA)
+    assert_allclose(results[1].snr_denoised, compute_snr(earth, denoised - earth))
+
+    path = tmp_path / "sweep.csv"
+    write_results(results, path)
+    assert_equal(len(path.read_text().splitlines()), len(results) + 1)
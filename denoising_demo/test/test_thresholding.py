@@ -0,0 +1,94 @@
+import numpy as np
+import pyssht as ssht
+from numpy.random import default_rng
+from numpy.testing import assert_allclose, assert_array_less, assert_equal
+
+from denoising_demo.test.constants import J_MIN, L_SMALL, N_SIGMA, SNR_IN, B
+from denoising_demo.utils.denoising import perform_denoising
+from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.thresholding import (
+    THRESHOLDING_STRATEGIES,
+    GarroteThresholding,
+    HardThresholding,
+    SoftThresholding,
+    ThresholdWorkspace,
+    create_thresholding_strategy,
+    mad_noise_level,
+)
+from denoising_demo.utils.vars import RANDOM_SEED
+from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
+
+
+def test_thresholding_operators() -> None:
+    """tests each operator against its closed form"""
+    workspace = ThresholdWorkspace(L_SMALL)
+    f = np.array([[-3.0, -1.0, 0.0, 0.5, 2.0]], dtype=np.complex_)
+    threshold = 1.5
+    expected = dict(
+        hard=[-3.0, 0.0, 0.0, 0.0, 2.0],
+        soft=[-1.5, 0.0, 0.0, 0.0, 0.5],
+        garrote=[-2.25, 0.0, 0.0, 0.0, 0.875],
+    )
+    for strategy in [HardThresholding(), SoftThresholding(), GarroteThresholding()]:
+        f_thresholded = f.copy()
+        n_zeroed = strategy.apply(f_thresholded, threshold, workspace)
+        assert_equal(n_zeroed, 3)
+        assert_allclose(f_thresholded[0], expected[strategy.name])
+
+
+def test_mad_noise_level() -> None:
+    """tests the MAD estimate recovers the std dev of Gaussian pixels"""
+    sigma = 2.0
+    shape = ssht.sample_shape(4 * L_SMALL)
+    f = sigma * default_rng(RANDOM_SEED).standard_normal(shape) + 0j
+    workspace = ThresholdWorkspace(4 * L_SMALL)
+    assert_allclose(mad_noise_level(f, workspace), sigma, rtol=0.1)
+
+
+def test_denoising_with_fixed_thresholds(earth) -> None:
+    """tests hard and garrote thresholding improve the SNR over the map"""
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    noised_snr = compute_snr(earth, nlm)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
+    for name in ["hard", "garrote"]:
+        denoised_earth_flm = perform_denoising(
+            L_SMALL,
+            earth,
+            earth + nlm,
+            wavelets,
+            SNR_IN,
+            N_SIGMA,
+            strategy=create_thresholding_strategy(name),
+        )
+        denoised_snr = compute_snr(earth, denoised_earth_flm - earth)
+        assert_array_less(noised_snr, denoised_snr)
+
+
+def test_estimated_noise_with_every_operator(earth) -> None:
+    """tests estimating the noise level from the noised map denoises as well
+    as knowing it with every operator, so improves the SNR with hard and
+    garrote thresholding
+    """
+    nlm = create_noise(L_SMALL, earth, SNR_IN)
+    noised_snr = compute_snr(earth, nlm)
+    wavelets = create_axisymmetric_wavelets(L_SMALL, B, J_MIN)
+    for name in THRESHOLDING_STRATEGIES:
+        known_snr, estimated_snr = (
+            compute_snr(
+                earth,
+                perform_denoising(
+                    L_SMALL,
+                    signal,
+                    earth + nlm,
+                    wavelets,
+                    SNR_IN,
+                    N_SIGMA,
+                    strategy=create_thresholding_strategy(name),
+                )
+                - earth,
+            )
+            for signal in [earth, None]
+        )
+        assert_allclose(estimated_snr, known_snr, atol=0.5)
+        if name != "soft":
+            assert_array_less(noised_snr, estimated_snr)
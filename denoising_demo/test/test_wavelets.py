@@ -3,7 +3,13 @@ from numpy.testing import assert_allclose, assert_equal
 from pys2let import pys2let_j_max
 
 from denoising_demo.test.constants import J_MIN, L_LARGE, L_SMALL, B
+from denoising_demo.test.reference_transforms import (
+    loop_wavelet_forward,
+    loop_wavelet_inverse,
+)
+from denoising_demo.utils.tiling_cache import TilingCache
 from denoising_demo.utils.wavelet_methods import (
+    axisymmetric_wavelet_forward,
     axisymmetric_wavelet_inverse,
     create_kappas,
 )
@@ -27,3 +33,54 @@ def test_create_kappas() -> None:
     j_max = pys2let_j_max(B, L_LARGE ** 2, J_MIN)
     assert_equal(j_max - J_MIN + 2, wavelets.shape[0])
     assert_equal(L_LARGE ** 2, wavelets.shape[1])
+
+
+def test_vectorised_transforms_match_loops(earth, axisymmetric_wavelets) -> None:
+    """Checks the vectorised transforms agree with the per-(ell, m) loops"""
+    dense_wavelets = axisymmetric_wavelets.to_dense()
+    w = axisymmetric_wavelet_forward(L_SMALL, earth, axisymmetric_wavelets)
+    assert_allclose(w, loop_wavelet_forward(L_SMALL, earth, dense_wavelets), rtol=1e-14)
+    assert_allclose(
+        axisymmetric_wavelet_inverse(L_SMALL, w, axisymmetric_wavelets),
+        loop_wavelet_inverse(L_SMALL, w, dense_wavelets),
+        rtol=1e-14,
+    )
+
+
+def test_compact_wavelet_power(axisymmetric_wavelets) -> None:
+    """Checks the compact wavelet power matches that of the dense wavelets"""
+    dense_wavelets = axisymmetric_wavelets.to_dense()
+    assert_equal(axisymmetric_wavelets.n_scales, dense_wavelets.shape[0])
+    assert_allclose(
+        axisymmetric_wavelets.wavelet_power(),
+        (np.abs(dense_wavelets) ** 2).sum(axis=1),
+        rtol=1e-14,
+    )
+
+
+def test_scale_bandlimits(axisymmetric_wavelets) -> None:
+    """Checks the scale bandlimits bound the support of each kappa"""
+    bandlimits = axisymmetric_wavelets.scale_bandlimits()
+    assert_equal(bandlimits.max(), L_SMALL)
+    for kappa, L_j in zip(axisymmetric_wavelets.kappas, bandlimits):
+        assert_equal(kappa[L_j:], 0)
+        assert kappa[L_j - 1] != 0
+
+
+def test_tiling_cache(tmp_path) -> None:
+    """Checks tilings are served from memory, then disk, before recomputing"""
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return dict(kappas=create_kappas(L_SMALL, B, J_MIN))
+
+    cache = TilingCache(directory=tmp_path)
+    kappas = cache.get(L_SMALL, B, J_MIN, compute)["kappas"]
+    assert_equal(cache.get(L_SMALL, B, J_MIN, compute)["kappas"], kappas)
+    assert_equal(cache.stats(), dict(hits=1, disk_hits=0, misses=1, size=1))
+
+    cache.clear()
+    assert_equal(cache.get(L_SMALL, B, J_MIN, compute)["kappas"], kappas)
+    assert_equal(cache.stats(), dict(hits=0, disk_hits=1, misses=0, size=1))
+    assert_equal(len(computed), 1)
@@ -1,13 +1,21 @@
-from argparse import ArgumentParser, Namespace
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from pathlib import Path
 
+from denoising_demo.utils.logger import configure_logging
+from denoising_demo.utils.thresholding import THRESHOLDING_STRATEGIES
 from denoising_demo.utils.vars import (
     B_DEFAULT,
     J_MIN_DEFAULT,
     L_DEFAULT,
     N_SIGMA_DEFAULT,
+    PRECISION_DEFAULT,
+    PRECISIONS,
     SNR_IN_DEFAULT,
+    WORKERS_DEFAULT,
 )
 
+_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
 
 def read_args() -> Namespace:
     """Method to read arguments from the command line
@@ -47,6 +55,90 @@ def read_args() -> Namespace:
         default=N_SIGMA_DEFAULT,
         help="the n_sigma used in the thresholding",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=WORKERS_DEFAULT,
+        help="the number of wavelet scales to threshold in parallel",
+    )
+    parser.add_argument(
+        "--band-limited",
+        action="store_true",
+        help="threshold each wavelet scale at its own bandlimit",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-T",
+        type=str,
+        default="hard",
+        choices=list(THRESHOLDING_STRATEGIES),
+        help="thresholding operator: defaults to hard",
+    )
+    parser.add_argument(
+        "--estimate-noise",
+        action="store_true",
+        help="estimate the noise level from the finest scale of the noised map, "
+        "not the signal, works with any --threshold operator",
+    )
+    parser.add_argument(
+        "--real",
+        action="store_true",
+        help="treat the maps as real fields, storing only the m>=0 coefficients",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="denoise one wavelet scale at a time to bound peak memory",
+    )
+    parser.add_argument(
+        "--precision",
+        "-p",
+        type=str,
+        default=PRECISION_DEFAULT,
+        choices=list(PRECISIONS),
+        help="precision of the wavelet coefficients: defaults to double",
+    )
+    parser.add_argument(
+        "--check-precision",
+        action="store_true",
+        help="report the SNR deviation from the double precision denoising",
+    )
+    parser.add_argument(
+        "--instrument",
+        type=Path,
+        default=None,
+        help="JSON file to write the timings and transform counts of the run to",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="also trace the peak memory of each stage when instrumenting",
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="skip the plots, i.e. on headless compute nodes",
+    )
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=WORKERS_DEFAULT,
+        help="the number of plots to render in parallel",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help=".npz file to write the harmonic coefficients and SNRs to",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="directory to cache the wavelet tilings in across runs",
+    )
     parser.add_argument(
         "--type",
         "-t",
@@ -57,4 +149,245 @@ def read_args() -> Namespace:
         choices=["abs", "real", "imag", "sum"],
         help="plotting type: defaults to real",
     )
+    _add_logging_args(parser)
+    return parser.parse_args()
+
+
+def read_sweep_args() -> Namespace:
+    """Method to read the parameter grids of a sweep from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Sweep the denoising parameters")
+    parser.add_argument(
+        "--bandlimit", "-L", type=int, default=L_DEFAULT, help="bandlimit"
+    )
+    parser.add_argument(
+        "--jmin",
+        "-j",
+        type=int,
+        nargs="+",
+        default=[J_MIN_DEFAULT],
+        help="the minimum wavelet scales",
+    )
+    parser.add_argument(
+        "--parameter",
+        "-B",
+        type=int,
+        nargs="+",
+        default=[B_DEFAULT],
+        help="the positive real parameters",
+    )
+    parser.add_argument(
+        "--noise",
+        "-n",
+        type=int,
+        nargs="+",
+        default=[SNR_IN_DEFAULT],
+        help="the SNR_IN of the noise levels",
+    )
+    parser.add_argument(
+        "--sigma",
+        "-s",
+        type=int,
+        nargs="+",
+        default=[N_SIGMA_DEFAULT],
+        help="the n_sigma values used in the thresholding",
+    )
+    parser.add_argument(
+        "--band-limited",
+        action="store_true",
+        help="threshold each wavelet scale at its own bandlimit",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="directory to cache the wavelet tilings in across runs",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("sweep.csv"),
+        help="the CSV file to write the results to",
+    )
+    _add_logging_args(parser)
     return parser.parse_args()
+
+
+def read_monte_carlo_args() -> Namespace:
+    """Method to read the settings of a Monte-Carlo run from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Denoise many noise realisations")
+    parser.add_argument(
+        "--bandlimit", "-L", type=int, default=L_DEFAULT, help="bandlimit"
+    )
+    parser.add_argument(
+        "--jmin",
+        "-j",
+        type=int,
+        default=J_MIN_DEFAULT,
+        help="the minimum wavelet scale",
+    )
+    parser.add_argument(
+        "--parameter",
+        "-B",
+        type=int,
+        default=B_DEFAULT,
+        help="the positive real parameter",
+    )
+    parser.add_argument(
+        "--noise",
+        "-n",
+        type=int,
+        default=SNR_IN_DEFAULT,
+        help="the SNR_IN of the noise level",
+    )
+    parser.add_argument(
+        "--sigma",
+        "-s",
+        type=int,
+        default=N_SIGMA_DEFAULT,
+        help="the n_sigma used in the thresholding",
+    )
+    parser.add_argument(
+        "--realisations",
+        "-N",
+        type=int,
+        default=100,
+        help="the number of noise realisations",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="the number of realisations per batch",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=WORKERS_DEFAULT,
+        help="the number of processes to run batches in",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="the .npz file to checkpoint to and resume from",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="directory to cache the wavelet tilings in across runs",
+    )
+    _add_logging_args(parser)
+    return parser.parse_args()
+
+
+def read_plot_args() -> Namespace:
+    """Method to read the saved results to plot from the command line
+
+    Returns:
+        Namespace: an argparse Namespace object
+    """
+    parser = ArgumentParser(description="Plot the results of a denoising run")
+    parser.add_argument(
+        "input", type=Path, help="the .npz file written by the demo with --output"
+    )
+    parser.add_argument(
+        "--type",
+        "-t",
+        type=str,
+        nargs="?",
+        default="real",
+        const="real",
+        choices=["abs", "real", "imag", "sum"],
+        help="plotting type: defaults to real",
+    )
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=WORKERS_DEFAULT,
+        help="the number of plots to render in parallel",
+    )
+    _add_logging_args(parser)
+    return parser.parse_args()
+
+
+def setup_logging(args: Namespace) -> None:
+    """Configures the logging from the command line arguments, attaching
+    the arguments to every record as the run parameters
+
+    Args:
+        args (Namespace): an argparse Namespace object
+    """
+    configure_logging(
+        args.log_level,
+        quiet=args.quiet,
+        json_lines=args.log_json,
+        module_levels=dict(args.log_module),
+        parameters=vars(args),
+    )
+
+
+def _add_logging_args(parser: ArgumentParser) -> None:
+    """Adds the logging settings shared by the scripts
+
+    Args:
+        parser (ArgumentParser): the parser of a script
+    """
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=_LOG_LEVELS,
+        help="level of the package logs: defaults to INFO",
+    )
+    parser.add_argument(
+        "--log-module",
+        type=module_level,
+        nargs="+",
+        default=[],
+        help="levels of individual modules, i.e. utils.noise=DEBUG",
+    )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="only log warnings and errors, i.e. for batch runs",
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="write the logs as JSON lines carrying the run parameters",
+    )
+
+
+def module_level(setting: str) -> tuple[str, str]:
+    """Parses the level of a module given as NAME=LEVEL on the command line
+
+    Args:
+        setting (str): the module relative to the package and its level,
+        i.e. utils.noise=DEBUG
+
+    Raises:
+        ArgumentTypeError: if the setting is malformed or the level unknown
+
+    Returns:
+        tuple[str, str]: the module and its level
+    """
+    name, separator, level = setting.partition("=")
+    if not name or not separator:
+        raise ArgumentTypeError(f"'{setting}' is not of the form NAME=LEVEL")
+    if level.upper() not in _LOG_LEVELS:
+        raise ArgumentTypeError(
+            f"'{level}' is not a level, choose from {', '.join(_LOG_LEVELS)}"
+        )
+    return name, level.upper()
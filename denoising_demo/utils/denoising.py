@@ -1,49 +1,307 @@
+import logging
+from typing import Optional
+
 import numpy as np
 
+from denoising_demo.utils.harmonic_index import harmonic_index, n_coefficients
+from denoising_demo.utils.harmonic_methods import to_full_spectrum, to_half_spectrum
+from denoising_demo.utils.instrumentation import instrumentation
 from denoising_demo.utils.noise import (
+    compute_scale_maps,
     compute_sigma_j,
     compute_snr,
+    estimate_sigma_j,
     harmonic_hard_thresholding,
+    multi_threshold_synthesis,
+    threshold_coefficients,
+)
+from denoising_demo.utils.thresholding import (
+    HardThresholding,
+    ThresholdingStrategy,
+    ThresholdWorkspace,
 )
 from denoising_demo.utils.wavelet_methods import (
+    AxisymmetricWavelets,
     axisymmetric_wavelet_forward,
     axisymmetric_wavelet_inverse,
+    create_axisymmetric_wavelets,
 )
 
+logger = logging.getLogger(__name__)
+
 
+@instrumentation.timed("perform_denoising")
 def perform_denoising(
     L: int,
-    signal: np.ndarray,
+    signal: Optional[np.ndarray],
     noised_signal: np.ndarray,
-    axisymmetric_wavelets: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
     snr_in: int,
     n_sigma: int,
+    workers: int = 1,
+    band_limited: bool = False,
+    strategy: Optional[ThresholdingStrategy] = None,
+    reality: bool = False,
 ) -> np.ndarray:
     """Performs signal denoising through hard-thresholding
 
     Args:
         L (int): bandlimit of the signal
-        signal (np.ndarray): harmonic coefficients of signal
+        signal (Optional[np.ndarray]): harmonic coefficients of signal, if None
+        the noise level is estimated from the noised signal and no SNR is
+        computed
         noised_signal (np.ndarray): noised harmonic coefficients of the signal
-        axisymmetric_wavelets (np.ndarray): the axisymmetric wavelets
-        snr_in (int): the desired level of noise
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise, unused without the signal
         n_sigma (int): how many sigmas of noise to threshold
+        workers (int, optional): the number of wavelet scales to threshold
+        concurrently. Defaults to 1.
+        band_limited (bool, optional): whether to take each wavelet scale to
+        pixel space at its own bandlimit rather than L. Defaults to False.
+        strategy (Optional[ThresholdingStrategy], optional): the thresholding
+        operator. Defaults to None, i.e. hard thresholding.
+        reality (bool, optional): whether the signal is real, so only the
+        m>=0 half-spectrum is kept internally and the real pixel-space
+        transforms are used, the input and output are full spectra.
+        Defaults to False.
 
     Returns:
         np.ndarray: the denoised harmonic coefficients of the noised signal
     """
+    # work in the precision of the wavelets
+    noised_signal = noised_signal.astype(axisymmetric_wavelets.dtype, copy=False)
+    if reality:
+        noised_signal = to_half_spectrum(noised_signal, L)
+
     # compute wavelet coefficients
-    w = axisymmetric_wavelet_forward(L, noised_signal, axisymmetric_wavelets)
+    w = axisymmetric_wavelet_forward(
+        L, noised_signal, axisymmetric_wavelets, reality=reality
+    )
 
     # compute wavelet noise
-    sigma_j = compute_sigma_j(signal, axisymmetric_wavelets[1:], snr_in)
+    sigma_j = (
+        estimate_sigma_j(L, w, axisymmetric_wavelets, reality)
+        if signal is None
+        else compute_sigma_j(signal, axisymmetric_wavelets, snr_in)
+    )
 
     # hard thresholding
-    w_denoised = harmonic_hard_thresholding(L, w, sigma_j, n_sigma)
+    bandlimits = axisymmetric_wavelets.scale_bandlimits() if band_limited else None
+    w_denoised = harmonic_hard_thresholding(
+        L,
+        w,
+        sigma_j,
+        n_sigma,
+        workers=workers,
+        bandlimits=bandlimits,
+        strategy=strategy,
+        reality=reality,
+    )
 
     # wavelet synthesis
-    flm = axisymmetric_wavelet_inverse(L, w_denoised, axisymmetric_wavelets)
+    flm = axisymmetric_wavelet_inverse(
+        L, w_denoised, axisymmetric_wavelets, reality=reality
+    )
+    if reality:
+        flm = to_full_spectrum(flm, L)
 
     # compute SNR
-    compute_snr(signal, flm - signal)
+    if signal is not None:
+        compute_snr(signal, flm - signal)
     return flm
+
+
+@instrumentation.timed("perform_streaming_denoising")
+def perform_streaming_denoising(
+    L: int,
+    signal: Optional[np.ndarray],
+    noised_signal: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    snr_in: int,
+    n_sigma: int,
+    band_limited: bool = False,
+    strategy: Optional[ThresholdingStrategy] = None,
+    reality: bool = False,
+) -> np.ndarray:
+    """Performs the same denoising as perform_denoising one scale at a time,
+    each scale's wavelet coefficients are created, thresholded and added to
+    the output before the next, so peak memory is O(L^2) independent of the
+    number of scales
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (Optional[np.ndarray]): harmonic coefficients of signal, if None
+        the noise level is estimated from the noised signal and no SNR is
+        computed
+        noised_signal (np.ndarray): noised harmonic coefficients of the signal
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise, unused without the signal
+        n_sigma (int): how many sigmas of noise to threshold
+        band_limited (bool, optional): whether to take each wavelet scale to
+        pixel space at its own bandlimit rather than L. Defaults to False.
+        strategy (Optional[ThresholdingStrategy], optional): the thresholding
+        operator. Defaults to None, i.e. hard thresholding.
+        reality (bool, optional): whether the signal is real, so only the
+        m>=0 half-spectrum is kept internally and the real pixel-space
+        transforms are used, the input and output are full spectra.
+        Defaults to False.
+
+    Returns:
+        np.ndarray: the denoised harmonic coefficients of the noised signal
+    """
+    if strategy is None:
+        strategy = HardThresholding()
+    index = harmonic_index(L)
+    ell = index.half_ell if reality else index.ell
+    # work in the precision of the wavelets
+    noised_signal = noised_signal.astype(axisymmetric_wavelets.dtype, copy=False)
+    if reality:
+        noised_signal = to_half_spectrum(noised_signal, L)
+    kappas = axisymmetric_wavelets.kappas
+
+    # compute wavelet noise
+    if signal is None:
+        w_finest = kappas[-1].take(ell) * noised_signal
+        sigma_j = estimate_sigma_j(
+            L, w_finest[np.newaxis], axisymmetric_wavelets, reality
+        )
+        del w_finest
+    else:
+        sigma_j = compute_sigma_j(signal, axisymmetric_wavelets, snr_in)
+    bandlimits = (
+        axisymmetric_wavelets.scale_bandlimits()
+        if band_limited
+        else np.full(axisymmetric_wavelets.n_scales, L)
+    )
+    workspace = ThresholdWorkspace(bandlimits[1:].max(initial=1))
+
+    # the scaling function is not thresholded
+    flm = kappas[0].take(ell) ** 2 * noised_signal
+    for j in range(1, axisymmetric_wavelets.n_scales):
+        logger.debug("start Psi^%d/%d", j, axisymmetric_wavelets.n_scales - 1)
+        n_j = n_coefficients(bandlimits[j], reality)
+        kernel = kappas[j].take(ell[:n_j])
+
+        # compute, threshold and synthesise the scale
+        w_j = kernel * noised_signal[:n_j]
+        w_j = threshold_coefficients(
+            bandlimits[j], w_j, n_sigma * sigma_j[j - 1], strategy, workspace, reality
+        )
+        flm[:n_j] += kernel * w_j
+    if reality:
+        flm = to_full_spectrum(flm, L)
+
+    # compute SNR
+    if signal is not None:
+        compute_snr(signal, flm - signal)
+    return flm
+
+
+def perform_multi_threshold_denoising(
+    L: int,
+    signal: np.ndarray,
+    noised_signal: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    snr_in: int,
+    n_sigmas: list[int],
+    snr_only: bool = False,
+    band_limited: bool = False,
+    reality: bool = False,
+) -> np.ndarray:
+    """Performs signal denoising through hard-thresholding at several levels,
+    the wavelet scales are taken to pixel space once and only the threshold,
+    return forward transforms and synthesis of each scale are repeated
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (np.ndarray): harmonic coefficients of signal
+        noised_signal (np.ndarray): noised harmonic coefficients of the signal
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise
+        n_sigmas (list[int]): how many sigmas of noise to threshold
+        snr_only (bool, optional): whether to return the SNR of each denoised
+        signal rather than its harmonic coefficients. Defaults to False.
+        band_limited (bool, optional): whether to take each wavelet scale to
+        pixel space at its own bandlimit rather than L. Defaults to False.
+        reality (bool, optional): whether the signal is real, so only the
+        m>=0 half-spectrum is kept internally and the real pixel-space
+        transforms are used, the input and output are full spectra.
+        Defaults to False.
+
+    Returns:
+        np.ndarray: the denoised harmonic coefficients of shape
+        (len(n_sigmas), L^2), or the SNR of each if snr_only
+    """
+    # work in the precision of the wavelets
+    noised_signal = noised_signal.astype(axisymmetric_wavelets.dtype, copy=False)
+    if reality:
+        noised_signal = to_half_spectrum(noised_signal, L)
+
+    # compute wavelet coefficients and their pixel values
+    w = axisymmetric_wavelet_forward(
+        L, noised_signal, axisymmetric_wavelets, reality=reality
+    )
+    bandlimits = axisymmetric_wavelets.scale_bandlimits() if band_limited else None
+    scale_maps = compute_scale_maps(L, w, bandlimits, reality)
+
+    # compute wavelet noise
+    sigma_j = compute_sigma_j(signal, axisymmetric_wavelets, snr_in)
+
+    # hard thresholding and wavelet synthesis at every level
+    flm = multi_threshold_synthesis(
+        L, w, scale_maps, sigma_j, np.asarray(n_sigmas), axisymmetric_wavelets, reality
+    )
+    if reality:
+        flm = to_full_spectrum(flm, L)
+
+    # compute SNR
+    snr = compute_snr(signal, flm - signal)
+    return snr if snr_only else flm
+
+
+def compare_precision(
+    L: int,
+    signal: np.ndarray,
+    noised_signal: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    snr_in: int,
+    n_sigma: int,
+    **kwargs,
+) -> float:
+    """Checks the denoising in the precision of the wavelets against the
+    double precision reference, so a lower precision can be adopted safely
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (np.ndarray): harmonic coefficients of signal
+        noised_signal (np.ndarray): noised harmonic coefficients of the signal
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise
+        n_sigma (int): how many sigmas of noise to threshold
+        kwargs: the remaining settings of perform_denoising
+
+    Returns:
+        float: the SNR in decibels of the denoised signal minus that of the
+        double precision reference
+    """
+    reference_wavelets = create_axisymmetric_wavelets(
+        L, axisymmetric_wavelets.B, axisymmetric_wavelets.j_min
+    )
+    snr, reference_snr = (
+        compute_snr(
+            signal,
+            perform_denoising(
+                L, signal, noised_signal, wavelets, snr_in, n_sigma, **kwargs
+            )
+            - signal,
+            log=False,
+        )
+        for wavelets in [axisymmetric_wavelets, reference_wavelets]
+    )
+    deviation = float(snr - reference_snr)
+    logger.info(
+        "SNR deviation of %s from complex128: %.2edB",
+        np.dtype(axisymmetric_wavelets.dtype).name,
+        deviation,
+    )
+    return deviation
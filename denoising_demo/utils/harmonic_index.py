@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from denoising_demo.utils.vars import HARMONIC_INDEX_CACHE_SIZE
+
+
+@dataclass(frozen=True)
+class HarmonicIndex:
+    """Read-only index tables of the harmonic coefficients of a signal with
+    bandlimit L, so that index arithmetic can be done on whole arrays rather
+    than with per-element ssht.elm2ind calls
+    """
+
+    L: int
+    ell: np.ndarray = field(init=False, repr=False)
+    m: np.ndarray = field(init=False, repr=False)
+    m0: np.ndarray = field(init=False, repr=False)
+    pos_m: np.ndarray = field(init=False, repr=False)
+    neg_m: np.ndarray = field(init=False, repr=False)
+    m_pair: np.ndarray = field(init=False, repr=False)
+    non_neg_m: np.ndarray = field(init=False, repr=False)
+    half_ell: np.ndarray = field(init=False, repr=False)
+    half_m0: np.ndarray = field(init=False, repr=False)
+    half_pos_m: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        ells = np.arange(self.L)
+        ell = np.repeat(ells, 2 * ells + 1)
+        m0 = ells * (ells + 1)
+        m = np.arange(self.L ** 2) - m0[ell]
+
+        # the m>0 coefficients and their m<0 counterparts
+        ell_pair, m_pair = np.tril_indices(self.L, k=-1)
+        m_pair = m_pair + 1
+        pos_m = m0[ell_pair] + m_pair
+        neg_m = m0[ell_pair] - m_pair
+
+        # the m>=0 half-spectrum of a real signal, ordered by ell then m
+        non_neg_m = np.flatnonzero(m >= 0)
+        half_ell = ell[non_neg_m]
+        half_m0 = ells * (ells + 1) // 2
+        half_pos_m = half_m0[ell_pair] + m_pair
+
+        for name, value in dict(
+            ell=ell,
+            m=m,
+            m0=m0,
+            pos_m=pos_m,
+            neg_m=neg_m,
+            m_pair=m_pair,
+            non_neg_m=non_neg_m,
+            half_ell=half_ell,
+            half_m0=half_m0,
+            half_pos_m=half_pos_m,
+        ).items():
+            value.flags.writeable = False
+            object.__setattr__(self, name, value)
+
+    def ell_slice(self, ell: int) -> slice:
+        """The indices of the coefficients of a given ell
+
+        Args:
+            ell (int): the harmonic degree
+
+        Returns:
+            slice: the slice covering m=-ell...ell
+        """
+        return slice(ell ** 2, (ell + 1) ** 2)
+
+
+def n_coefficients(L: int, reality: bool = False) -> int:
+    """The number of stored harmonic coefficients of a signal
+
+    Args:
+        L (int): bandlimit of the signal
+        reality (bool, optional): whether only the m>=0 half-spectrum of a
+        real signal is stored. Defaults to False.
+
+    Returns:
+        int: L^2, or L(L+1)/2 for the half-spectrum
+    """
+    return L * (L + 1) // 2 if reality else L ** 2
+
+
+@lru_cache(maxsize=HARMONIC_INDEX_CACHE_SIZE)
+def harmonic_index(L: int) -> HarmonicIndex:
+    """Gets the index tables of a bandlimit, cached across calls
+
+    Args:
+        L (int): bandlimit of the signal
+
+    Returns:
+        HarmonicIndex: the index tables
+    """
+    return HarmonicIndex(L)
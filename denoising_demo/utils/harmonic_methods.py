@@ -2,6 +2,9 @@ import numpy as np
 import pyssht as ssht
 from numpy.random import Generator
 
+from denoising_demo.utils.harmonic_index import harmonic_index
+from denoising_demo.utils.instrumentation import instrumentation
+
 
 def boost_coefficient_resolution(flm: np.ndarray, boost: int) -> np.ndarray:
     """pads the harmonic coefficients with zeros which boosts the plot
@@ -17,20 +20,25 @@ def boost_coefficient_resolution(flm: np.ndarray, boost: int) -> np.ndarray:
     return np.pad(flm, (0, boost), "constant")
 
 
-def invert_flm_boosted(flm: np.ndarray, L: int, resolution: int) -> np.ndarray:
+def invert_flm_boosted(
+    flm: np.ndarray, L: int, resolution: int, reality: bool = False
+) -> np.ndarray:
     """Performs an inverse harmonic transform with a boost in resolution
 
     Args:
         flm (np.ndarray): harmonic coefficients of the signal
         L (int): bandlimit of the signal
         resolution (int): the desired final resolution
+        reality (bool, optional): whether the signal is real, so the real
+        transform is used. Defaults to False.
 
     Returns:
         np.ndarray: [description]
     """
     boost = resolution ** 2 - L ** 2
     flm = boost_coefficient_resolution(flm, boost)
-    return ssht.inverse(flm, resolution)
+    instrumentation.count("ssht_inverse")
+    return ssht.inverse(flm, resolution, Reality=reality)
 
 
 def compute_random_signal(L: int, rng: Generator, var_signal: float) -> np.ndarray:
@@ -48,3 +56,48 @@ def compute_random_signal(L: int, rng: Generator, var_signal: float) -> np.ndarr
     return np.sqrt(var_signal / 2) * (
         rng.standard_normal(L ** 2) + 1j * rng.standard_normal(L ** 2)
     )
+
+
+def fill_negative_m(flm: np.ndarray, L: int) -> np.ndarray:
+    """Fills in, in place, the m<0 harmonic coefficients of a real signal
+    from the m>0 ones via flm(ell, -m) = (-1)^m conj(flm(ell, m))
+
+    Args:
+        flm (np.ndarray): harmonic coefficients of shape (..., L^2)
+        L (int): bandlimit of the signal
+
+    Returns:
+        np.ndarray: the input harmonic coefficients
+    """
+    index = harmonic_index(L)
+    flm[..., index.neg_m] = (-1) ** index.m_pair * flm[..., index.pos_m].conj()
+    return flm
+
+
+def to_half_spectrum(flm: np.ndarray, L: int) -> np.ndarray:
+    """Keeps the m>=0 harmonic coefficients of a real signal, the m<0 ones
+    are redundant
+
+    Args:
+        flm (np.ndarray): harmonic coefficients of shape (..., L^2)
+        L (int): bandlimit of the signal
+
+    Returns:
+        np.ndarray: the half-spectrum of shape (..., L(L+1)/2)
+    """
+    return flm[..., harmonic_index(L).non_neg_m]
+
+
+def to_full_spectrum(flm: np.ndarray, L: int) -> np.ndarray:
+    """Expands the m>=0 half-spectrum of a real signal to every m
+
+    Args:
+        flm (np.ndarray): half-spectrum of shape (..., L(L+1)/2)
+        L (int): bandlimit of the signal
+
+    Returns:
+        np.ndarray: the harmonic coefficients of shape (..., L^2)
+    """
+    full = np.empty(flm.shape[:-1] + (L ** 2,), dtype=flm.dtype)
+    full[..., harmonic_index(L).non_neg_m] = flm
+    return fill_negative_m(full, L)
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Callable, ContextManager, Iterator
+
+logger = logging.getLogger(__name__)
+
+_disabled = nullcontext()
+
+
+@dataclass
+class StageStatistics:
+    """The accumulated measurements of a named stage"""
+
+    calls: int = 0
+    seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class Instrumentation:
+    """Timers, optional tracemalloc peaks and counters for the stages of a
+    run, when disabled the stages and counters are no-ops so they can stay
+    wired into the pipeline. Only the measurements of the current process are
+    collected, i.e. not of the scales thresholded in a process pool
+    """
+
+    enabled: bool = False
+    trace_memory: bool = False
+    stages: dict[str, StageStatistics] = field(default_factory=dict)
+    counters: Counter = field(default_factory=Counter)
+    # the peak of each open stage, as nested stages reset the traced peak
+    _open_peaks: list[int] = field(default_factory=list, repr=False)
+    _started_tracing: bool = field(default=False, repr=False)
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Measures the enclosed block as a named stage
+
+        Args:
+            name (str): the name of the stage
+
+        Returns:
+            ContextManager[None]: the context manager to enclose the block in
+        """
+        if not self.enabled:
+            return _disabled
+        return self._measure(name)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """A decorator measuring every call of a function as a named stage
+
+        Args:
+            name (str): the name of the stage
+
+        Returns:
+            Callable[[Callable], Callable]: the decorator
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._measure(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increments a named counter, i.e. of the transforms executed
+
+        Args:
+            name (str): the name of the counter
+            n (int, optional): the increment. Defaults to 1.
+        """
+        if self.enabled:
+            self.counters[name] += n
+
+    def reset(self) -> None:
+        """Clears the measurements ready for another run"""
+        self.stages.clear()
+        self.counters.clear()
+
+    def summary(self) -> dict:
+        """The measurements of the run in a JSON serialisable form
+
+        Returns:
+            dict: the statistics of each stage and the counters
+        """
+        return dict(
+            stages={
+                name: dict(
+                    calls=statistics.calls,
+                    seconds=statistics.seconds,
+                    peak_bytes=statistics.peak_bytes if self.trace_memory else None,
+                )
+                for name, statistics in self.stages.items()
+            },
+            counters=dict(self.counters),
+        )
+
+    def write_summary(self, path: Path) -> None:
+        """Writes the summary of the run to a JSON file
+
+        Args:
+            path (Path): the JSON file to write to
+        """
+        path.write_text(json.dumps(self.summary(), indent=2))
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        """Times the block with a monotonic clock and optionally traces the
+        peak memory allocated within it
+
+        Args:
+            name (str): the name of the stage
+
+        Yields:
+            Iterator[None]: control to the enclosed block
+        """
+        start_bytes = self._enter_tracing() if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            statistics = self.stages.setdefault(name, StageStatistics())
+            statistics.calls += 1
+            statistics.seconds += seconds
+            peak_bytes = None
+            if self.trace_memory:
+                peak_bytes = self._exit_tracing() - start_bytes
+                statistics.peak_bytes = max(statistics.peak_bytes, peak_bytes)
+            logger.debug(
+                "%s took %.4fs",
+                name,
+                seconds,
+                extra=dict(stage=name, seconds=seconds, peak_bytes=peak_bytes),
+            )
+
+    def _enter_tracing(self) -> int:
+        """Starts tracing if needed and resets the peak for a new stage
+
+        Returns:
+            int: the traced memory when the stage starts
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._open_peaks.append(current)
+        return current
+
+    def _exit_tracing(self) -> int:
+        """Finds the peak of the stage ending, passing it on to any enclosing
+        stage, and stops tracing after the outermost stage
+
+        Returns:
+            int: the peak traced memory during the stage
+        """
+        _, peak = tracemalloc.get_traced_memory()
+        peak = max(self._open_peaks.pop(), peak)
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return peak
+
+
+instrumentation = Instrumentation(
+    enabled=os.environ.get("DENOISING_DEMO_INSTRUMENT") is not None
+)
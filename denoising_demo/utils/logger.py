@@ -1,8 +1,84 @@
+import json
 import logging
+from typing import Optional
 
-logging.basicConfig(
-    format="[%(asctime)s] [%(levelname)s] --- %(message)s (%(filename)s:%(lineno)s)",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
-logger = logging.getLogger(__name__)
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_FORMAT = "[%(asctime)s] [%(levelname)s] --- %(message)s (%(filename)s:%(lineno)s)"
+_PACKAGE = "denoising_demo"
+
+# the attributes of every record, anything else was passed through extra
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {
+    "asctime",
+    "message",
+}
+
+# the modules log to children of this logger, which is silent until configured
+logger = logging.getLogger(_PACKAGE)
+logger.addHandler(logging.NullHandler())
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as a single line of JSON, including any fields
+    passed through extra such as the run parameters and stage durations
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(
+            time=self.formatTime(record, _DATE_FORMAT),
+            level=record.levelname,
+            logger=record.name,
+            message=record.getMessage(),
+        )
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES
+        )
+        return json.dumps(entry, default=str)
+
+
+class RunParametersFilter(logging.Filter):
+    """Attaches the parameters of the run to every record"""
+
+    def __init__(self, parameters: dict) -> None:
+        super().__init__()
+        self.parameters = parameters
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run = self.parameters
+        return True
+
+
+def configure_logging(
+    level: str = "INFO",
+    quiet: bool = False,
+    json_lines: bool = False,
+    module_levels: Optional[dict[str, str]] = None,
+    parameters: Optional[dict] = None,
+) -> None:
+    """Sets up the output of the package loggers, replacing any previous
+    configuration, the root logger is left alone
+
+    Args:
+        level (str, optional): the level of the package. Defaults to "INFO".
+        quiet (bool, optional): only log warnings and errors, i.e. for batch
+        runs. Defaults to False.
+        json_lines (bool, optional): whether to write each record as a line
+        of JSON rather than text. Defaults to False.
+        module_levels (Optional[dict[str, str]], optional): the level of
+        individual modules relative to the package, i.e. utils.noise.
+        Defaults to None.
+        parameters (Optional[dict], optional): the parameters of the run to
+        attach to every record. Defaults to None.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        JsonLinesFormatter() if json_lines else logging.Formatter(_FORMAT, _DATE_FORMAT)
+    )
+    if parameters is not None:
+        handler.addFilter(RunParametersFilter(parameters))
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.WARNING if quiet else level.upper())
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(f"{_PACKAGE}.{name}").setLevel(module_level.upper())
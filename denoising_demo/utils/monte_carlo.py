@@ -0,0 +1,261 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from numpy.random import SeedSequence, default_rng
+
+from denoising_demo.utils.noise import (
+    compute_scale_maps,
+    compute_sigma_j,
+    compute_snr,
+    create_noise,
+    multi_threshold_synthesis,
+)
+from denoising_demo.utils.vars import RANDOM_SEED
+from denoising_demo.utils.wavelet_methods import AxisymmetricWavelets
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunningStatistics:
+    """Streaming mean and variance in constant memory, batches are merged
+    with the parallel form of Welford's algorithm
+    """
+
+    count: int = 0
+    mean: np.ndarray = field(default_factory=lambda: np.zeros(()))
+    m2: np.ndarray = field(default_factory=lambda: np.zeros(()))
+
+    def update(self, values: np.ndarray) -> None:
+        """Merges a batch of samples into the statistics
+
+        Args:
+            values (np.ndarray): the samples of shape (n, ...)
+        """
+        sample_axis = 0
+        n = values.shape[sample_axis]
+        batch_mean = values.mean(axis=sample_axis)
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=sample_axis)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray:
+        """The unbiased sample variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan * self.m2
+
+    @property
+    def standard_error(self) -> np.ndarray:
+        """The standard error of the mean"""
+        return np.sqrt(self.variance / self.count)
+
+
+@dataclass
+class MonteCarloResult:
+    """The running statistics of a Monte-Carlo run"""
+
+    n_realisations: int
+    snr_out: RunningStatistics = field(default_factory=RunningStatistics)
+    retained_fraction: RunningStatistics = field(default_factory=RunningStatistics)
+
+
+def run_monte_carlo(
+    L: int,
+    signal: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    snr_in: int,
+    n_sigma: int,
+    n_realisations: int,
+    batch_size: int = 16,
+    workers: int = 1,
+    seed: int = RANDOM_SEED,
+    checkpoint: Optional[Path] = None,
+) -> MonteCarloResult:
+    """Denoises many noise realisations of the signal, streaming the mean and
+    variance of the output SNR and of the fraction of pixels retained by the
+    thresholding of each scale. Each batch draws from its own child of the
+    seed, so results do not depend on the number of workers
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (np.ndarray): harmonic coefficients of the signal
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise
+        n_sigma (int): how many sigmas of noise to threshold
+        n_realisations (int): the number of noise realisations
+        batch_size (int, optional): realisations per batch. Defaults to 16.
+        workers (int, optional): the number of processes. Defaults to 1.
+        seed (int, optional): the root seed of the noise.
+        Defaults to RANDOM_SEED.
+        checkpoint (Optional[Path], optional): .npz file the statistics are
+        saved to after every batch and resumed from. Defaults to None.
+
+    Returns:
+        MonteCarloResult: the statistics over all realisations
+    """
+    # every setting that changes the statistics, stored as strings so the
+    # precision of the wavelets can be included
+    config = np.array(
+        [
+            L,
+            axisymmetric_wavelets.B,
+            axisymmetric_wavelets.j_min,
+            np.dtype(axisymmetric_wavelets.dtype).name,
+            snr_in,
+            n_sigma,
+            n_realisations,
+            batch_size,
+            seed,
+        ],
+        dtype=str,
+    )
+    result = MonteCarloResult(n_realisations)
+    n_batches = -(-n_realisations // batch_size)
+    next_batch = _load_checkpoint(checkpoint, config, result)
+    batches = [
+        (batch, min(batch_size, n_realisations - batch * batch_size))
+        for batch in range(next_batch, n_batches)
+    ]
+
+    with ProcessPoolExecutor(workers) as executor:
+        # submit a window of batches at a time to bound the memory
+        for start in range(0, len(batches), workers):
+            window = batches[start : start + workers]
+            futures = [
+                executor.submit(
+                    _run_batch,
+                    L,
+                    signal,
+                    axisymmetric_wavelets,
+                    snr_in,
+                    n_sigma,
+                    size,
+                    SeedSequence(seed, spawn_key=(batch,)),
+                )
+                for batch, size in window
+            ]
+            for (batch, _), future in zip(window, futures):
+                snrs, fractions = future.result()
+                result.snr_out.update(snrs)
+                result.retained_fraction.update(fractions)
+                _save_checkpoint(checkpoint, config, result, batch + 1)
+            logger.info(
+                "%d/%d realisations: SNR=%.2f+/-%.2f",
+                result.snr_out.count,
+                n_realisations,
+                result.snr_out.mean,
+                result.snr_out.standard_error,
+            )
+    return result
+
+
+def _run_batch(
+    L: int,
+    signal: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    snr_in: int,
+    n_sigma: int,
+    size: int,
+    seed_sequence: SeedSequence,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Denoises a batch of noise realisations
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (np.ndarray): harmonic coefficients of the signal
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        snr_in (int): the desired level of noise
+        n_sigma (int): how many sigmas of noise to threshold
+        size (int): the number of realisations
+        seed_sequence (SeedSequence): the seed of the batch
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the output SNR of each realisation and
+        the fraction of pixels retained in each of its wavelet scales
+    """
+    nlm = create_noise(
+        L, signal, snr_in, rng=default_rng(seed_sequence), n_realisations=size
+    )
+    sigma_j = compute_sigma_j(signal, axisymmetric_wavelets, snr_in)
+    thresholds = n_sigma * sigma_j
+    flms = np.empty_like(nlm)
+    fractions = np.empty((size, thresholds.shape[0]))
+    for k, noised_signal in enumerate(signal + nlm):
+        w = axisymmetric_wavelets.forward(noised_signal)
+        scale_maps = compute_scale_maps(L, w)
+        fractions[k] = [
+            (np.abs(f) >= threshold).mean()
+            for f, threshold in zip(scale_maps, thresholds)
+        ]
+        flms[k] = multi_threshold_synthesis(
+            L, w, scale_maps, sigma_j, np.array([n_sigma]), axisymmetric_wavelets
+        )[0]
+    return compute_snr(signal, flms - signal), fractions
+
+
+def _load_checkpoint(
+    checkpoint: Optional[Path], config: np.ndarray, result: MonteCarloResult
+) -> int:
+    """Restores the statistics of an interrupted run
+
+    Args:
+        checkpoint (Optional[Path]): the checkpoint file
+        config (np.ndarray): the parameters of the run
+        result (MonteCarloResult): the statistics to restore into
+
+    Raises:
+        ValueError: if the checkpoint is of a different run
+
+    Returns:
+        int: the next batch to run
+    """
+    if checkpoint is None or not checkpoint.exists():
+        return 0
+    with np.load(checkpoint) as data:
+        if not np.array_equal(data["config"], config):
+            raise ValueError(f"checkpoint '{checkpoint}' is of a different run")
+        for name in ["snr_out", "retained_fraction"]:
+            stats = getattr(result, name)
+            stats.count = int(data["count"])
+            stats.mean = data[f"{name}_mean"]
+            stats.m2 = data[f"{name}_m2"]
+        logger.info("resuming from '%s' at %d realisations", checkpoint, stats.count)
+        return int(data["next_batch"])
+
+
+def _save_checkpoint(
+    checkpoint: Optional[Path],
+    config: np.ndarray,
+    result: MonteCarloResult,
+    next_batch: int,
+) -> None:
+    """Saves the statistics, via a temporary file so an interruption while
+    writing leaves the previous checkpoint intact
+
+    Args:
+        checkpoint (Optional[Path]): the checkpoint file
+        config (np.ndarray): the parameters of the run
+        result (MonteCarloResult): the statistics to save
+        next_batch (int): the next batch to run
+    """
+    if checkpoint is None:
+        return
+    tmpfile = checkpoint.with_suffix(".tmp.npz")
+    np.savez(
+        tmpfile,
+        config=config,
+        next_batch=next_batch,
+        count=result.snr_out.count,
+        snr_out_mean=result.snr_out.mean,
+        snr_out_m2=result.snr_out.m2,
+        retained_fraction_mean=result.retained_fraction.mean,
+        retained_fraction_m2=result.retained_fraction.m2,
+    )
+    tmpfile.replace(checkpoint)
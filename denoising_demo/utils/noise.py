@@ -1,74 +1,119 @@
-from typing import Union
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Optional, Union
 
 import numpy as np
 import pyssht as ssht
-from numpy.random import default_rng
-
-from denoising_demo.utils.logger import logger
+from numpy.random import Generator, default_rng
+from numpy.typing import DTypeLike
+
+from denoising_demo.utils.harmonic_index import harmonic_index, n_coefficients
+from denoising_demo.utils.harmonic_methods import (
+    fill_negative_m,
+    to_full_spectrum,
+    to_half_spectrum,
+)
+from denoising_demo.utils.instrumentation import instrumentation
+from denoising_demo.utils.thresholding import (
+    HardThresholding,
+    ThresholdingStrategy,
+    ThresholdWorkspace,
+    mad_noise_level,
+)
 from denoising_demo.utils.vars import RANDOM_SEED
+from denoising_demo.utils.wavelet_methods import AxisymmetricWavelets
+
+logger = logging.getLogger(__name__)
 
 
-def _signal_power(signal: np.ndarray) -> float:
+def _signal_power(signal: np.ndarray) -> np.ndarray:
     """Computes the power of the signal
 
     Args:
-        signal (np.ndarray): the harmonic coefficients of the signal
+        signal (np.ndarray): the harmonic coefficients of the signal,
+        or a stack of them
 
     Returns:
-        float: the energy of the signal
+        np.ndarray: the energy of the signal, or of each in the stack
     """
-    return (np.abs(signal) ** 2).sum()
+    lm_axis = -1
+    return (np.abs(signal) ** 2).sum(axis=lm_axis)
 
 
-def compute_snr(signal: np.ndarray, noise: np.ndarray) -> float:
+def compute_snr(signal: np.ndarray, noise: np.ndarray, log: bool = True) -> np.ndarray:
     """Computes the SNR of the input signal
 
     Args:
         signal (np.ndarray): the harmonic coefficients of the initial signal
-        noise (np.ndarray): the harmonic coefficients of the Gaussian noise
+        noise (np.ndarray): the harmonic coefficients of the Gaussian noise,
+        or a stack of noises
+        log (bool, optional): whether to log the SNR, i.e. not when the
+        pipeline already has. Defaults to True.
 
     Returns:
-        float: the SNR in decibels of the signal
+        np.ndarray: the SNR in decibels of the signal, a scalar for a
+        single noise or one per noise if stacked
     """
     snr = 10 * np.log10(_signal_power(signal) / _signal_power(noise))
-    logger.info(f"SNR: {snr:.2f}")
+    if log and logger.isEnabledFor(logging.INFO):
+        logger.info("SNR: %s", np.round(snr, 2))
     return snr
 
 
-def create_noise(L: int, signal: np.ndarray, snr_in: int) -> np.ndarray:
+def create_noise(
+    L: int,
+    signal: np.ndarray,
+    snr_in: int,
+    rng: Optional[Union[Generator, int]] = None,
+    n_realisations: Optional[int] = None,
+    reality: bool = False,
+    dtype: DTypeLike = np.complex_,
+) -> np.ndarray:
     """Computes Gaussian white noise of the signal
 
     Args:
         L (int): bandlimit of the signal
         signal (np.ndarray): harmonic coefficients of the signal
         snr_in (int): parameter to control the noise level
+        rng (Optional[Union[Generator, int]], optional): random generator
+        object or seed. Defaults to None, i.e. seeded with RANDOM_SEED.
+        n_realisations (Optional[int], optional): number of independent
+        realisations to stack. Defaults to None, i.e. a single realisation.
+        reality (bool, optional): whether to only return the m>=0
+        half-spectrum, the noise is real either way. Defaults to False.
+        dtype (DTypeLike, optional): the precision of the noise, the draws are
+        the same whatever the precision. Defaults to np.complex_.
 
     Returns:
-        np.ndarray: the harmonic coefficients of the noise
+        np.ndarray: the harmonic coefficients of the noise of shape (L^2,)
+        or (n_realisations, L^2), or L(L+1)/2 for the half-spectrum
     """
     # set random seed
-    rng = default_rng(RANDOM_SEED)
-
-    # initialise
-    nlm = np.zeros(L ** 2, dtype=np.complex_)
+    rng = default_rng(RANDOM_SEED if rng is None else rng)
+    n_stack = 1 if n_realisations is None else n_realisations
 
     # std dev of the noise
     sigma_noise = compute_sigma_noise(signal, snr_in)
 
+    # the m=0 reals are followed by the real then imaginary parts of m>0
+    index = harmonic_index(L)
+    n_pm = index.pos_m.shape[0]
+    draws = rng.standard_normal((n_stack, L ** 2))
+
     # compute noise
-    for ell in range(L):
-        ind = ssht.elm2ind(ell, 0)
-        nlm[ind] = sigma_noise * rng.standard_normal()
-        for m in range(1, ell + 1):
-            ind_pm = ssht.elm2ind(ell, m)
-            ind_nm = ssht.elm2ind(ell, -m)
-            nlm[ind_pm] = (
-                sigma_noise
-                / np.sqrt(2)
-                * (rng.standard_normal() + 1j * rng.standard_normal())
-            )
-            nlm[ind_nm] = (-1) ** m * nlm[ind_pm].conj()
-    return nlm
+    m0, pos_m = (
+        (index.half_m0, index.half_pos_m) if reality else (index.m0, index.pos_m)
+    )
+    nlm: np.ndarray = np.empty((n_stack, n_coefficients(L, reality)), dtype=dtype)
+    nlm[:, m0] = sigma_noise * draws[:, :L]
+    nlm[:, pos_m] = (
+        sigma_noise / np.sqrt(2) * (draws[:, L : L + n_pm] + 1j * draws[:, L + n_pm :])
+    )
+    if not reality:
+        fill_negative_m(nlm, L)
+    return nlm[0] if n_realisations is None else nlm
 
 
 def compute_sigma_noise(
@@ -87,25 +132,63 @@ def compute_sigma_noise(
     return np.sqrt(10 ** (-snr_in / 10) * _signal_power(signal) / signal.shape[0])
 
 
-def compute_sigma_j(signal: np.ndarray, psi_j: np.ndarray, snr_in: int) -> np.ndarray:
+def compute_sigma_j(
+    signal: np.ndarray, wavelets: AxisymmetricWavelets, snr_in: int
+) -> np.ndarray:
     """Computes the wavlet noise standard deviation for each wavelet
 
     Args:
         signal (np.ndarray): the harmonic coefficients of the signal
-        psi_j (np.ndarray): the wavelets
+        wavelets (AxisymmetricWavelets): the axisymmetric wavelets
         snr_in (int): the level of noise
 
     Returns:
         np.ndarray: the sigma_j values for each wavelet
     """
-    lm_axis = 1
     sigma_noise = compute_sigma_noise(signal, snr_in)
-    wavelet_power = (np.abs(psi_j) ** 2).sum(axis=lm_axis)
+    # the scaling function is not thresholded
+    wavelet_power = wavelets.wavelet_power()[1:]
     return sigma_noise * np.sqrt(wavelet_power)
 
 
+def estimate_sigma_j(
+    L: int,
+    wav_coeffs: np.ndarray,
+    wavelets: AxisymmetricWavelets,
+    reality: bool = False,
+) -> np.ndarray:
+    """Estimates the wavelet noise standard deviation for each wavelet from
+    the noised map alone, through the median absolute deviation of the
+    pixels of the finest scale, where the noise dominates the signal
+
+    Args:
+        L (int): bandlimit of the signal
+        wav_coeffs (np.ndarray): the wavelet coefficients of the noised map
+        wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
+
+    Returns:
+        np.ndarray: the sigma_j values for each wavelet
+    """
+    f = _pixel_inverse(L, wav_coeffs[-1], reality)
+    sigma_finest = mad_noise_level(f, ThresholdWorkspace(L))
+    # white noise has a pixel std dev in each scale of sigma * sqrt(power_j)
+    wavelet_power = wavelets.wavelet_power()
+    sigma_noise = sigma_finest / np.sqrt(wavelet_power[-1])
+    return sigma_noise * np.sqrt(wavelet_power[1:])
+
+
+@instrumentation.timed("harmonic_hard_thresholding")
 def harmonic_hard_thresholding(
-    L: int, wav_coeffs: np.ndarray, sigma_j: np.ndarray, n_sigma: int
+    L: int,
+    wav_coeffs: np.ndarray,
+    sigma_j: np.ndarray,
+    n_sigma: int,
+    workers: int = 1,
+    bandlimits: Optional[np.ndarray] = None,
+    strategy: Optional[ThresholdingStrategy] = None,
+    reality: bool = False,
 ) -> np.ndarray:
     """Thresholds the wavelet coefficients of the signal
 
@@ -114,39 +197,418 @@ def harmonic_hard_thresholding(
         wav_coeffs (np.ndarray): the input wavelet coefficients
         sigma_j (np.ndarray): the noise level of each wavelet
         n_sigma (int): the number of sigma to threshold
+        workers (int, optional): the number of processes to threshold the
+        scales across, see batched_hard_thresholding. Defaults to 1.
+        bandlimits (Optional[np.ndarray], optional): the bandlimit of each
+        scale to perform the pixel-space round trip at. Defaults to None.
+        strategy (Optional[ThresholdingStrategy], optional): the thresholding
+        operator. Defaults to None, i.e. hard thresholding.
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
+
+    Returns:
+        np.ndarray: the thresholded wavelet coefficients
+    """
+    return batched_hard_thresholding(
+        L,
+        wav_coeffs,
+        sigma_j,
+        n_sigma,
+        out=wav_coeffs,
+        workers=workers,
+        bandlimits=bandlimits,
+        strategy=strategy,
+        reality=reality,
+    )
+
+
+def batched_hard_thresholding(
+    L: int,
+    wav_coeffs: np.ndarray,
+    sigma_j: np.ndarray,
+    n_sigma: int,
+    out: Optional[np.ndarray] = None,
+    workers: int = 1,
+    bandlimits: Optional[np.ndarray] = None,
+    strategy: Optional[ThresholdingStrategy] = None,
+    reality: bool = False,
+) -> np.ndarray:
+    """Thresholds a stack of wavelet coefficients, i.e. multiple maps and/or
+    noise realisations, reusing the same pixel-space workspace throughout
+
+    Args:
+        L (int): bandlimit of the signals
+        wav_coeffs (np.ndarray): the wavelet coefficients of shape
+        (..., J+1, L^2), or (..., J+1, L(L+1)/2) for real signals
+        sigma_j (np.ndarray): the noise level of each wavelet of shape (J,)
+        or one per map of shape (..., J)
+        n_sigma (int): the number of sigma to threshold
+        out (Optional[np.ndarray], optional): where to write the result,
+        may be wav_coeffs itself. Defaults to None.
+        workers (int, optional): the number of processes to threshold the
+        scales across, the scales are independent so the output is identical
+        to the serial path. pyssht holds the GIL so threads would not help,
+        and each call starts a new pool and copies the whole stack into
+        shared memory, so this only pays off for large L. Defaults to 1.
+        bandlimits (Optional[np.ndarray], optional): the bandlimit of each
+        scale, see AxisymmetricWavelets.scale_bandlimits, so that scale j is
+        taken to pixel space at L_j rather than L. The threshold is not
+        rescaled as the pixel variance of a band-limited field does not
+        depend on the sampling density, but the pixels thresholded are the
+        coarser L_j samples so the result differs slightly from sampling at
+        L. Defaults to None, i.e. every scale at L.
+        strategy (Optional[ThresholdingStrategy], optional): the thresholding
+        operator. Defaults to None, i.e. hard thresholding.
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals, so only half the coefficients are
+        stored and the real pixel-space transforms are used. Defaults to
+        False.
 
     Returns:
         np.ndarray: the thresholded wavelet coefficients
     """
-    logger.info("begin harmonic hard thresholding")
+    if strategy is None:
+        strategy = HardThresholding()
+    n_scales = wav_coeffs.shape[-2]
+    stack = wav_coeffs.reshape(-1, n_scales, n_coefficients(L, reality))
+    if out is None:
+        out = np.empty_like(wav_coeffs)
+    thresholded = out.reshape(stack.shape)
+    thresholds = n_sigma * np.broadcast_to(
+        sigma_j, wav_coeffs.shape[:-2] + (n_scales - 1,)
+    ).reshape(stack.shape[0], n_scales - 1)
+    if bandlimits is None:
+        bandlimits = np.full(n_scales, L)
+
+    logger.info("begin harmonic %s thresholding", strategy.name)
     # don't threshold the scaling function
-    for j, coefficient in enumerate(wav_coeffs[1:]):
-        logger.info(f"start Psi^{j + 1}/{len(wav_coeffs)-1}")
+    thresholded[:, 0] = stack[:, 0]
+    scales = range(1, n_scales)
+    if workers == 1:
+        workspace = ThresholdWorkspace(bandlimits[1:].max(initial=1))
+        for j in scales:
+            _threshold_scale(
+                strategy,
+                bandlimits,
+                stack,
+                thresholded,
+                thresholds,
+                j,
+                workspace,
+                reality=reality,
+            )
+    else:
+        _threshold_scales_in_processes(
+            strategy, bandlimits, stack, thresholded, thresholds, workers, reality
+        )
+    return out
+
+
+def compute_scale_maps(
+    L: int,
+    wav_coeffs: np.ndarray,
+    bandlimits: Optional[np.ndarray] = None,
+    reality: bool = False,
+) -> list[np.ndarray]:
+    """Takes each wavelet scale, but not the scaling function, to pixel space
+    so the maps can be thresholded at several levels without redoing the
+    inverse transforms
 
-        # convert to pixel space
-        f = ssht.inverse(coefficient, L)
+    Args:
+        L (int): bandlimit of the signal
+        wav_coeffs (np.ndarray): the wavelet coefficients
+        bandlimits (Optional[np.ndarray], optional): the bandlimit of each
+        scale. Defaults to None, i.e. every scale at L.
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
 
-        # threshold
-        f_thresholded = _perform_hard_thresholding(f, sigma_j[j], n_sigma)
+    Returns:
+        list[np.ndarray]: the pixel values of each wavelet scale
+    """
+    if bandlimits is None:
+        bandlimits = np.full(wav_coeffs.shape[0], L)
+    return [
+        _pixel_inverse(L_j, coefficient[: n_coefficients(L_j, reality)], reality)
+        for coefficient, L_j in zip(wav_coeffs[1:], bandlimits[1:])
+    ]
+
+
+def multi_threshold_synthesis(
+    L: int,
+    wav_coeffs: np.ndarray,
+    scale_maps: list[np.ndarray],
+    sigma_j: np.ndarray,
+    n_sigmas: np.ndarray,
+    axisymmetric_wavelets: AxisymmetricWavelets,
+    reality: bool = False,
+) -> np.ndarray:
+    """Thresholds the pixel values from compute_scale_maps at several levels
+    and synthesises the signal of each level, the magnitude of each map is
+    computed once and the synthesis is accumulated scale by scale, so the
+    thresholded wavelet coefficients of every level are never held at once
 
-        # convert back
-        wav_coeffs[j + 1] = ssht.forward(f_thresholded, L)
-    return wav_coeffs
+    Args:
+        L (int): bandlimit of the signal
+        wav_coeffs (np.ndarray): the wavelet coefficients of the maps
+        scale_maps (list[np.ndarray]): the pixel values of each wavelet scale
+        sigma_j (np.ndarray): the noise level of each wavelet
+        n_sigmas (np.ndarray): the numbers of sigma to threshold
+        axisymmetric_wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
 
+    Returns:
+        np.ndarray: the denoised harmonic coefficients of shape
+        (len(n_sigmas), L^2), or (len(n_sigmas), L(L+1)/2) for real signals
+    """
+    index = harmonic_index(L)
+    ell = index.half_ell if reality else index.ell
+    kappas = axisymmetric_wavelets.kappas
+
+    # the scaling function is not thresholded so is common to every level
+    flms = np.empty((len(n_sigmas), wav_coeffs.shape[-1]), dtype=wav_coeffs.dtype)
+    flms[:] = kappas[0].take(ell) * wav_coeffs[0]
+    for j, f in enumerate(scale_maps, start=1):
+        L_j = f.shape[0]
+        n_j = n_coefficients(L_j, reality)
+        kernel = kappas[j].take(ell[:n_j])
+        magnitude = np.abs(f)
+        for t, threshold in enumerate(np.asarray(n_sigmas) * sigma_j[j - 1]):
+            mask = magnitude < threshold
+            n_zeroed = np.count_nonzero(mask)
+            # no round trip needed if the scale is kept or removed whole
+            if n_zeroed == 0:
+                flms[t, :n_j] += kernel * wav_coeffs[j, :n_j]
+            elif n_zeroed < f.size:
+                flms[t, :n_j] += kernel * _pixel_forward(
+                    L_j, np.where(mask, 0, f), reality
+                )
+    return flms
+
+
+def pixel_amplitude_bound(L: int, flm: np.ndarray, reality: bool = False) -> np.ndarray:
+    """Bounds the largest pixel magnitude of a signal from its harmonic
+    coefficients, using |Y_lm| <= sqrt((2ell+1)/4pi)
+
+    Args:
+        L (int): bandlimit of the signal
+        flm (np.ndarray): harmonic coefficients of shape (..., L^2)
+        reality (bool, optional): whether flm is the m>=0 half-spectrum of a
+        real signal. Defaults to False.
 
-def _perform_hard_thresholding(
-    f: np.ndarray, sigma_j: Union[float, np.ndarray], n_sigma: int
+    Returns:
+        np.ndarray: the upper bound of max|f| of each signal
+    """
+    lm_axis = -1
+    index = harmonic_index(L)
+    ell = index.half_ell if reality else index.ell
+    weight = np.sqrt((2 * ell + 1) / (4 * np.pi))
+    if reality:
+        # each m>0 coefficient also stands in for its m<0 counterpart
+        weight *= 2
+        weight[index.half_m0] /= 2
+    return (np.abs(flm) * weight).sum(axis=lm_axis)
+
+
+def _threshold_scale(
+    strategy: ThresholdingStrategy,
+    bandlimits: np.ndarray,
+    stack: np.ndarray,
+    thresholded: np.ndarray,
+    thresholds: np.ndarray,
+    j: int,
+    workspace: Optional[ThresholdWorkspace] = None,
+    reality: bool = False,
+) -> None:
+    """Thresholds scale j of every map in the stack at its bandlimit L_j,
+    the coefficients with ell >= L_j are zero
+
+    Args:
+        strategy (ThresholdingStrategy): the thresholding operator
+        bandlimits (np.ndarray): the bandlimit of each scale
+        stack (np.ndarray): the wavelet coefficients of shape (K, J+1, L^2)
+        thresholded (np.ndarray): where to write the thresholded coefficients
+        thresholds (np.ndarray): the threshold of each map and wavelet
+        j (int): the wavelet scale
+        workspace (Optional[ThresholdWorkspace], optional): preallocated
+        pixel-space buffers. Defaults to None.
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
+    """
+    logger.debug("start Psi^%d/%d", j, stack.shape[1] - 1)
+    L_j = bandlimits[j]
+    n_j = n_coefficients(L_j, reality)
+    thresholded[:, j, n_j:] = 0
+    if L_j == 0:
+        return
+    if workspace is None:
+        workspace = ThresholdWorkspace(L_j)
+    for k, coefficient in enumerate(stack[:, j, :n_j]):
+        thresholded[k, j, :n_j] = threshold_coefficients(
+            L_j, coefficient, thresholds[k, j - 1], strategy, workspace, reality
+        )
+
+
+def threshold_coefficients(
+    L: int,
+    coefficient: np.ndarray,
+    threshold: float,
+    strategy: ThresholdingStrategy,
+    workspace: ThresholdWorkspace,
+    reality: bool = False,
 ) -> np.ndarray:
-    """Set pixels in real space to zero if the magnitude is less than
-    the threshold
+    """Thresholds the harmonic coefficients of a single wavelet scale in
+    pixel space, skipping the round trip where the scale is kept or removed
+    whole
+
+    Args:
+        L (int): bandlimit of the scale
+        coefficient (np.ndarray): the wavelet coefficients of the scale
+        threshold (float): n_sigma times the noise level of the wavelet
+        strategy (ThresholdingStrategy): the thresholding operator
+        workspace (ThresholdWorkspace): preallocated pixel-space buffers
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectrum of a real signal, so the real transforms are used.
+        Defaults to False.
+
+    Returns:
+        np.ndarray: the thresholded wavelet coefficients, which may be the
+        input coefficients themselves
+    """
+    # skip the round trip if the scale is kept or removed whole
+    if threshold <= 0:
+        return coefficient
+    if threshold > pixel_amplitude_bound(L, coefficient, reality):
+        return np.zeros_like(coefficient)
+
+    # convert to pixel space
+    f = _pixel_inverse(L, coefficient, reality)
+
+    # threshold
+    n_zeroed = strategy.apply(f, threshold, workspace)
+
+    # convert back, unless no pixels or every pixel was zeroed
+    if n_zeroed == 0 and strategy.keeps_unthresholded:
+        return coefficient
+    if n_zeroed == f.size:
+        return np.zeros_like(coefficient)
+    return _pixel_forward(L, f, reality).astype(coefficient.dtype, copy=False)
+
+
+def _pixel_inverse(L: int, flm: np.ndarray, reality: bool) -> np.ndarray:
+    """Takes harmonic coefficients to pixel space, a real signal is only
+    expanded to every m for the real transform which returns real pixels,
+    SSHT only works in double precision so the pixels are always double
+
+    Args:
+        L (int): bandlimit of the signal
+        flm (np.ndarray): harmonic coefficients, or the m>=0 half-spectrum
+        reality (bool): whether flm is the half-spectrum of a real signal
+
+    Returns:
+        np.ndarray: the pixel values of the signal
+    """
+    instrumentation.count("ssht_inverse")
+    if reality:
+        flm = to_full_spectrum(flm, L)
+    return ssht.inverse(
+        np.ascontiguousarray(flm, dtype=np.complex_), L, Reality=reality
+    )
+
+
+def _pixel_forward(L: int, f: np.ndarray, reality: bool) -> np.ndarray:
+    """Takes pixel values to harmonic coefficients
 
     Args:
+        L (int): bandlimit of the signal
         f (np.ndarray): the pixel values of the signal
-        sigma_j (Union[float, np.ndarray]): the noise level of each wavelet
-        n_sigma (int): number of sigma to threshold
+        reality (bool): whether to use the real transform and keep the m>=0
+        half-spectrum
 
     Returns:
-        np.ndarray: the thresholded wavelt scale j
+        np.ndarray: the harmonic coefficients, or the m>=0 half-spectrum
+    """
+    instrumentation.count("ssht_forward")
+    flm = ssht.forward(f, L, Reality=reality)
+    return to_half_spectrum(flm, L) if reality else flm
+
+
+def _threshold_scales_in_processes(
+    strategy: ThresholdingStrategy,
+    bandlimits: np.ndarray,
+    stack: np.ndarray,
+    thresholded: np.ndarray,
+    thresholds: np.ndarray,
+    workers: int,
+    reality: bool = False,
+) -> None:
+    """Thresholds the wavelet scales across a process pool, the coefficients
+    are shared through shared memory rather than pickled to each process
+
+    Args:
+        strategy (ThresholdingStrategy): the thresholding operator
+        bandlimits (np.ndarray): the bandlimit of each scale
+        stack (np.ndarray): the wavelet coefficients of shape (K, J+1, L^2)
+        thresholded (np.ndarray): where to write the thresholded coefficients
+        thresholds (np.ndarray): the threshold of each map and wavelet
+        workers (int): the number of processes
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
+    """
+    shared = shared_memory.SharedMemory(create=True, size=stack.nbytes)
+    try:
+        buffer: np.ndarray = np.ndarray(
+            stack.shape, dtype=stack.dtype, buffer=shared.buf
+        )
+        buffer[:] = stack
+        with ProcessPoolExecutor(workers) as executor:
+            threshold_scale = partial(
+                _threshold_shared_scale,
+                shared.name,
+                stack.shape,
+                stack.dtype.str,
+                strategy,
+                bandlimits,
+                thresholds,
+                reality,
+            )
+            list(executor.map(threshold_scale, range(1, stack.shape[1])))
+        thresholded[:, 1:] = buffer[:, 1:]
+        del buffer
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def _threshold_shared_scale(
+    name: str,
+    shape: tuple[int, ...],
+    dtype: str,
+    strategy: ThresholdingStrategy,
+    bandlimits: np.ndarray,
+    thresholds: np.ndarray,
+    reality: bool,
+    j: int,
+) -> None:
+    """Thresholds scale j in place in a shared memory block
+
+    Args:
+        name (str): the name of the shared memory block
+        shape (tuple[int, ...]): the shape of the wavelet coefficients
+        dtype (str): the dtype of the wavelet coefficients
+        strategy (ThresholdingStrategy): the thresholding operator
+        bandlimits (np.ndarray): the bandlimit of each scale
+        thresholds (np.ndarray): the threshold of each map and wavelet
+        reality (bool): whether the coefficients are the m>=0 half-spectra
+        of real signals
+        j (int): the wavelet scale
     """
-    threshold = n_sigma * sigma_j
-    return np.where(np.abs(f) < threshold, 0, f)
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        buffer: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=shared.buf)
+        _threshold_scale(
+            strategy, bandlimits, buffer, buffer, thresholds, j, reality=reality
+        )
+        del buffer
+    finally:
+        shared.close()
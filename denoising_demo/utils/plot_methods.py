@@ -1,8 +1,14 @@
+import logging
+from functools import lru_cache
+
 import numpy as np
 import pyssht as ssht
 
 from denoising_demo.utils.harmonic_methods import invert_flm_boosted
-from denoising_demo.utils.logger import logger
+from denoising_demo.utils.instrumentation import instrumentation
+from denoising_demo.utils.vars import PLOT_MESH_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
 
 
 def calc_plot_resolution(L: int) -> int:
@@ -35,7 +41,7 @@ def create_plot_type(field: np.ndarray, plot_type: str) -> np.ndarray:
     Returns:
         np.ndarray: the resultant plot type of the signal
     """
-    logger.info(f"plotting type: '{plot_type}'")
+    logger.info("plotting type: '%s'", plot_type)
     plot_dict = dict(
         abs=np.abs(field), imag=field.imag, real=field.real, sum=field.real + field.imag
     )
@@ -53,5 +59,37 @@ def boost_field(field: np.ndarray, L: int, resolution: int) -> np.ndarray:
     Returns:
         np.ndarray: [description]
     """
-    flm = ssht.forward(field, L)
-    return invert_flm_boosted(flm, L, resolution)
+    # real maps, e.g. from the real-field mode, use the real transforms
+    reality = np.isrealobj(field)
+    instrumentation.count("ssht_forward")
+    flm = ssht.forward(field, L, Reality=reality)
+    return invert_flm_boosted(flm, L, resolution, reality=reality)
+
+
+@lru_cache(maxsize=PLOT_MESH_CACHE_SIZE)
+def sphere_mesh(
+    resolution: int, method: str = "MW", close: bool = True
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the samples of the sphere and their Cartesian coordinates,
+    cached as the mesh is the same for every signal plotted at a resolution
+
+    Args:
+        resolution (int): the bandlimit of the plot
+        method (str, optional): the sampling scheme. Defaults to "MW".
+        close (bool, optional): whether to close up the samples by repeating
+        the first phi. Defaults to True.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        the read-only thetas, phis and x, y, z values of the samples
+    """
+    thetas, phis = ssht.sample_positions(resolution, Grid=True, Method=method)
+    if close:
+        first_row, phi_index = 0, 1
+        _, n_phi = ssht.sample_shape(resolution, Method=method)
+        thetas = np.insert(thetas, n_phi, thetas[:, first_row], axis=phi_index)
+        phis = np.insert(phis, n_phi, phis[:, first_row], axis=phi_index)
+    mesh = (thetas, phis, *ssht.s2_to_cart(thetas, phis))
+    for array in mesh:
+        array.flags.writeable = False
+    return mesh
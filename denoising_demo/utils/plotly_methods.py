@@ -1,7 +1,9 @@
-from plotly.graph_objs import Layout
-from plotly.graph_objs.layout import Margin, Scene
-from plotly.graph_objs.layout.scene import Camera, XAxis, YAxis, ZAxis
-from plotly.graph_objs.layout.scene.camera import Eye
+from typing import TYPE_CHECKING
+
+# plotly is only imported once a plot is made
+if TYPE_CHECKING:
+    from plotly.graph_objs import Layout
+    from plotly.graph_objs.layout.scene import Camera
 
 _axis = dict(
     title="",
@@ -18,7 +20,7 @@ def create_camera(
     y_eye: float,
     z_eye: float,
     zoom: float,
-) -> Camera:
+) -> "Camera":
     """Adjusts the position of the plotly camera
 
     Args:
@@ -30,10 +32,13 @@ def create_camera(
     Returns:
         Camera: a plotly camera object
     """
+    from plotly.graph_objs.layout.scene import Camera
+    from plotly.graph_objs.layout.scene.camera import Eye
+
     return Camera(eye=Eye(x=x_eye / zoom, y=y_eye / zoom, z=z_eye / zoom))
 
 
-def create_layout(camera: Camera) -> Layout:
+def create_layout(camera: "Camera") -> "Layout":
     """A default plotly layout
 
     Args:
@@ -42,6 +47,10 @@ def create_layout(camera: Camera) -> Layout:
     Returns:
         Layout: a plotly layout object
     """
+    from plotly.graph_objs import Layout
+    from plotly.graph_objs.layout import Margin, Scene
+    from plotly.graph_objs.layout.scene import XAxis, YAxis, ZAxis
+
     return Layout(
         scene=Scene(
             dragmode="orbit",
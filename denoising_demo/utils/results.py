@@ -0,0 +1,60 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+_FLM_PREFIX = "flm_"
+_SNR_PREFIX = "snr_"
+
+
+@dataclass
+class DenoisingResults:
+    """The harmonic coefficients and SNRs of a denoising run, saved to disk so
+    that plotting can happen later and elsewhere
+    """
+
+    L: int
+    flms: dict[str, np.ndarray]
+    snrs: dict[str, float] = field(default_factory=dict)
+    parameters: dict = field(default_factory=dict)
+
+    def save(self, path: Path) -> None:
+        """Writes the results to a compressed .npz file
+
+        Args:
+            path (Path): the file to write to
+        """
+        np.savez_compressed(
+            path,
+            L=self.L,
+            parameters=json.dumps(self.parameters, default=str),
+            **{f"{_FLM_PREFIX}{name}": flm for name, flm in self.flms.items()},
+            **{f"{_SNR_PREFIX}{name}": snr for name, snr in self.snrs.items()},
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "DenoisingResults":
+        """Reads the results written by save
+
+        Args:
+            path (Path): the .npz file to read
+
+        Returns:
+            DenoisingResults: the results of the run
+        """
+        with np.load(path) as data:
+            return cls(
+                L=int(data["L"]),
+                flms={
+                    key[len(_FLM_PREFIX) :]: data[key]
+                    for key in data.files
+                    if key.startswith(_FLM_PREFIX)
+                },
+                snrs={
+                    key[len(_SNR_PREFIX) :]: float(data[key])
+                    for key in data.files
+                    if key.startswith(_SNR_PREFIX)
+                },
+                parameters=json.loads(str(data["parameters"])),
+            )
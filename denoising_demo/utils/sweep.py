@@ -0,0 +1,97 @@
+import csv
+import logging
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from numpy.random import Generator
+
+from denoising_demo.utils.denoising import perform_multi_threshold_denoising
+from denoising_demo.utils.noise import compute_snr, create_noise
+from denoising_demo.utils.wavelet_methods import create_axisymmetric_wavelets
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepResult:
+    """The input and output SNR of one configuration of the sweep"""
+
+    L: int
+    B: int
+    j_min: int
+    snr_in: int
+    n_sigma: int
+    snr_noised: float
+    snr_denoised: float
+
+
+def run_sweep(
+    L: int,
+    signal: np.ndarray,
+    snr_ins: list[int],
+    n_sigmas: list[int],
+    Bs: list[int],
+    j_mins: list[int],
+    band_limited: bool = False,
+    rng: Optional[Union[Generator, int]] = None,
+) -> list[SweepResult]:
+    """Denoises the signal over a grid of parameters, the noised signal is
+    created once per SNR_IN and the pixel maps of its wavelet scales once per
+    (B, j_min, SNR_IN), as only the thresholding depends on n_sigma
+
+    Args:
+        L (int): bandlimit of the signal
+        signal (np.ndarray): harmonic coefficients of the signal
+        snr_ins (list[int]): the levels of noise
+        n_sigmas (list[int]): how many sigmas of noise to threshold
+        Bs (list[int]): the positive real parameters
+        j_mins (list[int]): the minimum wavelet scales
+        band_limited (bool, optional): whether to take each wavelet scale to
+        pixel space at its own bandlimit rather than L. Defaults to False.
+        rng (Optional[Union[Generator, int]], optional): random generator
+        object or seed of the noise. Defaults to None.
+
+    Returns:
+        list[SweepResult]: the SNRs of every configuration
+    """
+    noised_signals = {}
+    for snr_in in snr_ins:
+        nlm = create_noise(L, signal, snr_in, rng=rng)
+        noised_signals[snr_in] = (signal + nlm, float(compute_snr(signal, nlm)))
+
+    results: list[SweepResult] = []
+    for B, j_min in product(Bs, j_mins):
+        logger.info("sweeping B=%d, J0=%d", B, j_min)
+        wavelets = create_axisymmetric_wavelets(L, B, j_min)
+        for snr_in, (noised_signal, snr_noised) in noised_signals.items():
+            snrs_denoised = perform_multi_threshold_denoising(
+                L,
+                signal,
+                noised_signal,
+                wavelets,
+                snr_in,
+                n_sigmas,
+                snr_only=True,
+                band_limited=band_limited,
+            )
+            results.extend(
+                SweepResult(L, B, j_min, snr_in, n_sigma, snr_noised, snr_denoised)
+                for n_sigma, snr_denoised in zip(n_sigmas, snrs_denoised)
+            )
+    return results
+
+
+def write_results(results: list[SweepResult], path: Path) -> None:
+    """Writes the sweep results as a CSV table with one row per configuration
+
+    Args:
+        results (list[SweepResult]): the SNRs of every configuration
+        path (Path): the CSV file to write
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, [field.name for field in fields(SweepResult)])
+        writer.writeheader()
+        writer.writerows(asdict(result) for result in results)
@@ -0,0 +1,163 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyssht as ssht
+
+# converts the median absolute deviation of Gaussian noise to its std dev
+_MAD_TO_SIGMA = 0.6745
+
+
+@dataclass
+class ThresholdWorkspace:
+    """Reusable pixel-space buffers for thresholding maps of bandlimit
+    up to L
+    """
+
+    L: int
+    _magnitude: np.ndarray = field(init=False, repr=False)
+    _mask: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        n_samples = np.prod(ssht.sample_shape(self.L))
+        self._magnitude = np.empty(n_samples)
+        self._mask = np.empty(n_samples, dtype=bool)
+
+    def buffers(self, shape: tuple[int, ...]) -> tuple[np.ndarray, np.ndarray]:
+        """Views of the buffers for a map of the given shape
+
+        Args:
+            shape (tuple[int, ...]): the pixel shape of the map
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: the magnitude and mask buffers
+        """
+        n_samples = int(np.prod(shape))
+        return (
+            self._magnitude[:n_samples].reshape(shape),
+            self._mask[:n_samples].reshape(shape),
+        )
+
+
+class ThresholdingStrategy(ABC):
+    """A thresholding operator acting in place on the pixels of a wavelet
+    scale, using the buffers of a workspace rather than allocating
+    """
+
+    name: str
+    # whether the pixels above the threshold are left untouched
+    keeps_unthresholded: bool = True
+
+    @abstractmethod
+    def apply(
+        self, f: np.ndarray, threshold: float, workspace: ThresholdWorkspace
+    ) -> int:
+        """Thresholds the pixels in place
+
+        Args:
+            f (np.ndarray): the pixel values of the wavelet scale
+            threshold (float): n_sigma times the noise level of the wavelet
+            workspace (ThresholdWorkspace): preallocated pixel-space buffers
+
+        Returns:
+            int: the number of pixels set to zero
+        """
+
+
+class HardThresholding(ThresholdingStrategy):
+    """Set pixels to zero if the magnitude is less than the threshold"""
+
+    name = "hard"
+
+    def apply(
+        self, f: np.ndarray, threshold: float, workspace: ThresholdWorkspace
+    ) -> int:
+        magnitude, mask = workspace.buffers(f.shape)
+        np.abs(f, out=magnitude)
+        np.less(magnitude, threshold, out=mask)
+        f[mask] = 0
+        return int(np.count_nonzero(mask))
+
+
+class SoftThresholding(ThresholdingStrategy):
+    """Shrink the magnitude of every pixel towards zero by the threshold"""
+
+    name = "soft"
+    keeps_unthresholded = False
+
+    def apply(
+        self, f: np.ndarray, threshold: float, workspace: ThresholdWorkspace
+    ) -> int:
+        magnitude, mask = workspace.buffers(f.shape)
+        np.abs(f, out=magnitude)
+        np.less(magnitude, threshold, out=mask)
+
+        # the shrinkage factor max(0, 1 - t / |f|)
+        with np.errstate(divide="ignore"):
+            np.divide(threshold, magnitude, out=magnitude)
+        np.subtract(1, magnitude, out=magnitude)
+        np.maximum(magnitude, 0, out=magnitude)
+        f *= magnitude
+        return int(np.count_nonzero(mask))
+
+
+class GarroteThresholding(ThresholdingStrategy):
+    """The non-negative garrote, a compromise between hard and soft which
+    shrinks large pixels less than soft thresholding does
+    """
+
+    name = "garrote"
+    keeps_unthresholded = False
+
+    def apply(
+        self, f: np.ndarray, threshold: float, workspace: ThresholdWorkspace
+    ) -> int:
+        magnitude, mask = workspace.buffers(f.shape)
+        np.abs(f, out=magnitude)
+        np.less(magnitude, threshold, out=mask)
+
+        # the shrinkage factor max(0, 1 - t^2 / |f|^2)
+        np.square(magnitude, out=magnitude)
+        with np.errstate(divide="ignore"):
+            np.divide(threshold ** 2, magnitude, out=magnitude)
+        np.subtract(1, magnitude, out=magnitude)
+        np.maximum(magnitude, 0, out=magnitude)
+        f *= magnitude
+        return int(np.count_nonzero(mask))
+
+
+def mad_noise_level(f: np.ndarray, workspace: ThresholdWorkspace) -> float:
+    """Robustly estimates the noise standard deviation of a map through the
+    median absolute deviation of its real part
+
+    Args:
+        f (np.ndarray): the pixel values of the map
+        workspace (ThresholdWorkspace): preallocated pixel-space buffers
+
+    Returns:
+        float: the estimated standard deviation
+    """
+    deviation, _ = workspace.buffers(f.shape)
+    np.subtract(f.real, np.median(f.real), out=deviation)
+    np.abs(deviation, out=deviation)
+    return float(np.median(deviation, overwrite_input=True) / _MAD_TO_SIGMA)
+
+
+THRESHOLDING_STRATEGIES: dict[str, type[ThresholdingStrategy]] = dict(
+    hard=HardThresholding,
+    soft=SoftThresholding,
+    garrote=GarroteThresholding,
+)
+
+
+def create_thresholding_strategy(name: str) -> ThresholdingStrategy:
+    """Creates a thresholding strategy by name, any of them can be combined
+    with the noise level estimated from the noised map, see estimate_sigma_j
+
+    Args:
+        name (str): one of hard/soft/garrote
+
+    Returns:
+        ThresholdingStrategy: the thresholding strategy
+    """
+    return THRESHOLDING_STRATEGIES[name]()
@@ -0,0 +1,133 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from denoising_demo.utils.vars import TILING_CACHE_SIZE
+
+Tiling = dict[str, np.ndarray]
+
+
+@dataclass
+class TilingCache:
+    """An in-process LRU cache of wavelet tilings keyed on (L, B, j_min),
+    optionally backed by .npz files in a directory so that tilings persist
+    across processes
+    """
+
+    maxsize: int = TILING_CACHE_SIZE
+    directory: Optional[Path] = None
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[tuple[int, int, int], Tiling]" = field(
+        default_factory=OrderedDict, repr=False
+    )
+
+    def get(self, L: int, B: int, j_min: int, compute: Callable[[], Tiling]) -> Tiling:
+        """Gets the tiling from memory, then disk, otherwise computes it
+
+        Args:
+            L (int): bandlimit of the signal
+            B (int): positive real parameter
+            j_min (int): minimum wavelet scale
+            compute (Callable[[], Tiling]): computes the named tiling arrays
+
+        Returns:
+            Tiling: the read-only tiling arrays
+        """
+        key = (L, B, j_min)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        tiling = self._read(key)
+        if tiling is None:
+            self.misses += 1
+            tiling = compute()
+            self._write(key, tiling)
+        else:
+            self.disk_hits += 1
+
+        for array in tiling.values():
+            array.flags.writeable = False
+        self._entries[key] = tiling
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return tiling
+
+    def clear(self) -> None:
+        """Empties the in-process cache and resets the counters, the files
+        on disk are kept
+        """
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """The cache counters for monitoring
+
+        Returns:
+            dict[str, int]: the hits, disk hits, misses and current size
+        """
+        return dict(
+            hits=self.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+            size=len(self._entries),
+        )
+
+    def _path(self, key: tuple[int, int, int]) -> Optional[Path]:
+        """The content-addressed file of a tiling
+
+        Args:
+            key (tuple[int, int, int]): the (L, B, j_min) of the tiling
+
+        Returns:
+            Optional[Path]: the .npz file, None if there is no directory
+        """
+        if self.directory is None:
+            return None
+        digest = sha256(repr(key).encode()).hexdigest()
+        return Path(self.directory) / f"tiling_{digest}.npz"
+
+    def _read(self, key: tuple[int, int, int]) -> Optional[Tiling]:
+        """Reads a tiling from disk
+
+        Args:
+            key (tuple[int, int, int]): the (L, B, j_min) of the tiling
+
+        Returns:
+            Optional[Tiling]: the tiling, None if not on disk
+        """
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def _write(self, key: tuple[int, int, int], tiling: Tiling) -> None:
+        """Writes a tiling to disk, via a temporary file so that concurrent
+        processes never read a partial file
+
+        Args:
+            key (tuple[int, int, int]): the (L, B, j_min) of the tiling
+            tiling (Tiling): the tiling arrays
+        """
+        path = self._path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmpfile = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmpfile, **tiling)
+        tmpfile.replace(path)
+
+
+_cache_directory = os.environ.get("DENOISING_DEMO_CACHE_DIR")
+tiling_cache = TilingCache(
+    directory=Path(_cache_directory) if _cache_directory is not None else None
+)
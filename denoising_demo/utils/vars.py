@@ -1,7 +1,13 @@
 B_DEFAULT = 2
+HARMONIC_INDEX_CACHE_SIZE: int = 8
 J_MIN_DEFAULT = 0
 L_DEFAULT = 128
 N_SIGMA_DEFAULT = 3
+PLOT_MESH_CACHE_SIZE: int = 4
+PRECISION_DEFAULT = "double"
+PRECISIONS: dict[str, str] = dict(single="complex64", double="complex128")
 RANDOM_SEED: int = 30
 SNR_IN_DEFAULT = 10
+TILING_CACHE_SIZE: int = 32
 UNSEEN: float = -1.56e30
+WORKERS_DEFAULT = 1
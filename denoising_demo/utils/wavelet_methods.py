@@ -1,62 +1,194 @@
+from dataclasses import dataclass, field
+from functools import partial
+
 import numpy as np
-import pyssht as ssht
-from pys2let import axisym_wav_l
+from numpy.typing import DTypeLike
+
+from denoising_demo.utils.harmonic_index import harmonic_index
+from denoising_demo.utils.instrumentation import instrumentation
+from denoising_demo.utils.tiling_cache import tiling_cache
+
 
+@dataclass
+class AxisymmetricWavelets:
+    """A compact representation of axisymmetric wavelets which only stores
+    the (n_scales, L) real tiling of the harmonic line, as the dense
+    harmonic coefficients are only non-zero for m=0, the tiling is held in
+    the real precision of dtype so the transforms keep the coefficients in it
+    """
 
+    L: int
+    B: int
+    j_min: int
+    dtype: DTypeLike = np.complex_
+    kappas: np.ndarray = field(init=False, repr=False)
+    _wavelet_power: np.ndarray = field(init=False, repr=False)
+    # the kernel spread over each layout, built on first use
+    _kernels: dict[bool, np.ndarray] = field(
+        init=False, repr=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        tiling = tiling_cache.get(
+            self.L,
+            self.B,
+            self.j_min,
+            partial(_compute_tiling, self.L, self.B, self.j_min),
+        )
+        # the real precision of dtype, i.e. float32 for complex64
+        real_dtype = np.empty(0, dtype=self.dtype).real.dtype
+        self.kappas = tiling["kappas"].astype(real_dtype, copy=False)
+        self._wavelet_power = tiling["wavelet_power"]
+
+    def __getstate__(self) -> dict:
+        # the kernels are cheap to rebuild, so are not sent to worker processes
+        return {**vars(self), "_kernels": {}}
+
+    @property
+    def n_scales(self) -> int:
+        """The number of scales including the scaling function"""
+        return self.kappas.shape[0]
+
+    def forward(self, flm: np.ndarray, reality: bool = False) -> np.ndarray:
+        """Computes the axisymmetric wavelet forward transform, the kernel
+        sqrt(4pi/(2ell+1)) * psi_ell0 reduces to kappa_ell
+
+        Args:
+            flm (np.ndarray): harmonic coefficients of the signal
+            reality (bool, optional): whether flm is the m>=0 half-spectrum
+            of a real signal. Defaults to False.
+
+        Returns:
+            np.ndarray: the wavelet coefficients of the signal
+        """
+        return self._kernel(reality) * flm
+
+    def inverse(self, wav_coeffs: np.ndarray, reality: bool = False) -> np.ndarray:
+        """Computes the axisymmetric wavelet inverse transform
+
+        Args:
+            wav_coeffs (np.ndarray): the wavelet coefficients of shape
+            (..., n_scales, L^2), or (..., n_scales, L(L+1)/2)
+            reality (bool, optional): whether the coefficients are the m>=0
+            half-spectra of real signals. Defaults to False.
+
+        Returns:
+            np.ndarray: the signal reconstructed from its wavelet coefficients
+        """
+        # contract over the scales without materialising the product
+        return np.einsum("...jl,jl->...l", wav_coeffs, self._kernel(reality))
+
+    def wavelet_power(self) -> np.ndarray:
+        """The power of each scale, i.e. the sum of |psi_lm|^2
+
+        Returns:
+            np.ndarray: the power of the scaling function and wavelets
+        """
+        return self._wavelet_power
+
+    def scale_bandlimits(self) -> np.ndarray:
+        """Computes the effective bandlimit of each scale, i.e. one more than
+        the largest ell in the support of its kappa
+
+        Returns:
+            np.ndarray: the bandlimit L_j of the scaling function and wavelets
+        """
+        ell_axis = 1
+        support = self.kappas != 0
+        last_ell = self.L - 1 - np.argmax(support[:, ::-1], axis=ell_axis)
+        return np.where(support.any(axis=ell_axis), last_ell + 1, 0)
+
+    def _kernel(self, reality: bool) -> np.ndarray:
+        """Spreads the tiling over the stored harmonic coefficients, computed
+        once per layout and reused by every transform
+
+        Args:
+            reality (bool): whether only the m>=0 half-spectrum is stored
+
+        Returns:
+            np.ndarray: the kernel of each scale of shape (n_scales, L^2),
+            or (n_scales, L(L+1)/2)
+        """
+        if reality not in self._kernels:
+            index = harmonic_index(self.L)
+            kernel = self.kappas.take(index.half_ell if reality else index.ell, axis=1)
+            kernel.flags.writeable = False
+            self._kernels[reality] = kernel
+        return self._kernels[reality]
+
+    def to_dense(self) -> np.ndarray:
+        """Materialises the dense harmonic coefficients of the wavelets
+
+        Returns:
+            np.ndarray: the wavelets of shape (n_scales, L^2)
+        """
+        ells = np.arange(self.L)
+        wavelets: np.ndarray = np.zeros((self.n_scales, self.L ** 2), dtype=self.dtype)
+        wavelets[:, harmonic_index(self.L).m0] = (
+            np.sqrt((2 * ells + 1) / (4 * np.pi)) * self.kappas
+        )
+        return wavelets
+
+
+@instrumentation.timed("axisymmetric_wavelet_forward")
 def axisymmetric_wavelet_forward(
-    L: int, flm: np.ndarray, wavelets: np.ndarray
+    L: int, flm: np.ndarray, wavelets: AxisymmetricWavelets, reality: bool = False
 ) -> np.ndarray:
     """Computes the axisymmetric wavelet forward transform
 
     Args:
         L (int): bandlimit of signal
         flm (np.ndarray): harmonic coefficients of the signal
-        wavelets (np.ndarray): the axisymmetric wavelets
+        wavelets (AxisymmetricWavelets): the axisymmetric wavelets
+        reality (bool, optional): whether flm is the m>=0 half-spectrum of a
+        real signal. Defaults to False.
 
     Returns:
         np.ndarray: the wavelet coefficients of the signal
     """
-    # initialise wavelet coefficients
-    w = np.zeros(wavelets.shape, dtype=np.complex_)
-
-    # fill in wavelet coefficient values
-    for ell in range(L):
-        ind_m0 = ssht.elm2ind(ell, 0)
-        wav_0 = np.sqrt((4 * np.pi) / (2 * ell + 1)) * wavelets[:, ind_m0].conj()
-        for m in range(-ell, ell + 1):
-            ind = ssht.elm2ind(ell, m)
-            w[:, ind] = wav_0 * flm[ind]
-    return w
+    _check_bandlimit(L, wavelets)
+    return wavelets.forward(flm, reality=reality)
 
 
+@instrumentation.timed("axisymmetric_wavelet_inverse")
 def axisymmetric_wavelet_inverse(
-    L: int, wav_coeffs: np.ndarray, wavelets: np.ndarray
+    L: int,
+    wav_coeffs: np.ndarray,
+    wavelets: AxisymmetricWavelets,
+    reality: bool = False,
 ) -> np.ndarray:
     """Computes the axisymmetric wavelet inverse transform
 
     Args:
         L (int): bandlimit of the signal
         wav_coeffs (np.ndarray): the wavelet coefficients
-        wavelets (np.ndarray): axisymmetric wavelets
+        wavelets (AxisymmetricWavelets): axisymmetric wavelets
+        reality (bool, optional): whether the coefficients are the m>=0
+        half-spectra of real signals. Defaults to False.
 
     Returns:
         np.ndarray: the signal reconstructed from its wavelet coefficients
     """
-    # initialise signal
-    flm = np.zeros(L ** 2, dtype=np.complex_)
+    _check_bandlimit(L, wavelets)
+    return wavelets.inverse(wav_coeffs, reality=reality)
 
-    # fill in the signal values
-    for ell in range(L):
-        ind_m0 = ssht.elm2ind(ell, 0)
-        wav_0 = np.sqrt((4 * np.pi) / (2 * ell + 1)) * wavelets[:, ind_m0]
-        for m in range(-ell, ell + 1):
-            ind = ssht.elm2ind(ell, m)
-            flm[ind] = (wav_coeffs[:, ind] * wav_0).sum()
-    return flm
 
+def _check_bandlimit(L: int, wavelets: AxisymmetricWavelets) -> None:
+    """Checks the wavelets were built for the bandlimit of the signal
+
+    Args:
+        L (int): bandlimit of the signal
+        wavelets (AxisymmetricWavelets): axisymmetric wavelets
+
+    Raises:
+        ValueError: if the bandlimits differ
+    """
+    if wavelets.L != L:
+        raise ValueError(f"wavelets have bandlimit {wavelets.L} but L={L}")
 
-def create_axisymmetric_wavelets(L: int, B: int, j_min: int) -> np.ndarray:
-    """Construct wavelets from a tiling of the harmonic line
+
+def _compute_tiling(L: int, B: int, j_min: int) -> dict[str, np.ndarray]:
+    """Computes the kappas and the derived wavelet power of a tiling
 
     Args:
         L (int): bandlimit of the signal
@@ -64,20 +196,31 @@ def create_axisymmetric_wavelets(L: int, B: int, j_min: int) -> np.ndarray:
         j_min (int): controls the lowest wavelet scale
 
     Returns:
-        np.ndarray: the harmonic coefficients of the axisymmetric wavelets
+        dict[str, np.ndarray]: the kappas and the power of each scale
     """
-    # create harmonic tiling
+    ell_axis = 1
+    ells = np.arange(L)
     kappas = create_kappas(L, B, j_min)
+    wavelet_power = ((2 * ells + 1) / (4 * np.pi) * kappas ** 2).sum(axis=ell_axis)
+    return dict(kappas=kappas, wavelet_power=wavelet_power)
 
-    # initialise empty wavelets
-    wavelets = np.zeros((kappas.shape[0], L ** 2), dtype=np.complex_)
 
-    # fill in wavelet values
-    for ell in range(L):
-        factor = np.sqrt((2 * ell + 1) / (4 * np.pi))
-        ind = ssht.elm2ind(ell, 0)
-        wavelets[:, ind] = factor * kappas[:, ell]
-    return wavelets
+def create_axisymmetric_wavelets(
+    L: int, B: int, j_min: int, dtype: DTypeLike = np.complex_
+) -> AxisymmetricWavelets:
+    """Construct wavelets from a tiling of the harmonic line
+
+    Args:
+        L (int): bandlimit of the signal
+        B (int): positive real parameter
+        j_min (int): controls the lowest wavelet scale
+        dtype (DTypeLike, optional): the precision of the wavelet coefficients,
+        i.e. np.complex64 for single precision. Defaults to np.complex_.
+
+    Returns:
+        AxisymmetricWavelets: the compact axisymmetric wavelets
+    """
+    return AxisymmetricWavelets(L, B, j_min, dtype)
 
 
 def create_kappas(xlim: int, B: int, j_min: int) -> np.ndarray:
@@ -92,5 +235,8 @@ def create_kappas(xlim: int, B: int, j_min: int) -> np.ndarray:
         np.ndarray: a tiling of the harmonic line for scaling function
         and wavelets
     """
+    # pys2let is only needed when the tiling is not cached
+    from pys2let import axisym_wav_l
+
     kappa0, kappa = axisym_wav_l(B, xlim, j_min)
     return np.concatenate((kappa0[np.newaxis], kappa.T))
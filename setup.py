@@ -10,6 +10,10 @@ setup(
     entry_points=dict(
         console_scripts=[
             "demo=denoising_demo.scripts.denoise_earth:main",
+            "sweep=denoising_demo.scripts.sweep:main",
+            "monte-carlo=denoising_demo.scripts.monte_carlo:main",
+            "plot=denoising_demo.scripts.plot_results:main",
+            "bench=denoising_demo.benchmarks.benchmark_pipeline:main",
         ],
     ),
 )